@@ -0,0 +1,102 @@
+"""Benchmarks for the Day-4 Product class.
+
+    python benchmark_products.py construct --rows 2000000
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import tempfile
+import time
+
+from q1_product_class import Product
+
+WORDS = ["Gaming", "Wireless", "Desk", "Field", "Wool", "Tennis", "Smart", "Travel", "Laptop", "Lamp",
+         "Guide", "Scarf", "Racket", "Speaker", "Kettle", "Bottle"]
+
+
+def synthesize_feed(rows, invalid_fraction, seed=42):
+    rng = random.Random(seed)
+    feed = []
+    for i in range(rows):
+        record = (f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}", round(rng.uniform(1, 5000), 2),
+                  round(rng.uniform(0, 60), 2), rng.randint(0, 500), rng.choice(Product.VALID_CATEGORIES))
+        if rng.random() < invalid_fraction:
+            record = (record[0], -record[1]) + record[2:]
+        feed.append(record)
+    return feed
+
+
+def per_object(records):
+    products, errors = [], []
+    for row, record in enumerate(records):
+        try:
+            products.append(Product(*record))
+        except ValueError as e:
+            errors.append((row, str(e)))
+    return products, errors
+
+
+def timed(label, fn, rows, results):
+    start = time.perf_counter()
+    products, errors = fn()
+    elapsed = time.perf_counter() - start
+    results[label] = {"rows_per_sec": round(rows / elapsed), "valid": len(products), "invalid": len(errors)}
+    return products
+
+
+def bench_construct(args):
+    records = synthesize_feed(args.rows, args.invalid_fraction, args.seed)
+    results = {"benchmark": "construct", "rows": args.rows, "invalid_fraction": args.invalid_fraction}
+
+    def bulk_records():
+        errors = []
+        return Product.from_records(records, errors=errors), errors
+
+    baseline = timed("per_object", lambda: per_object(records), args.rows, results)
+    bulk = timed("from_records", bulk_records, args.rows, results)
+    assert [p.product_summary for p in bulk[:1000]] == [p.product_summary for p in baseline[:1000]]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "feed.csv")
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(Product.FIELDS)
+            writer.writerows(records)
+
+        def csv_per_object():
+            with open(path, newline="") as f:
+                reader = csv.reader(f)
+                next(reader)
+                return per_object([(name, float(price), float(discount), int(stock), category)
+                                   for name, price, discount, stock, category in reader])
+
+        def bulk_csv():
+            errors = []
+            return Product.from_csv(path, errors=errors), errors
+
+        timed("csv_per_object", csv_per_object, args.rows, results)
+        timed("from_csv", bulk_csv, args.rows, results)
+
+    results["speedup_records"] = round(results["from_records"]["rows_per_sec"] / results["per_object"]["rows_per_sec"], 2)
+    results["speedup_csv"] = round(results["from_csv"]["rows_per_sec"] / results["csv_per_object"]["rows_per_sec"], 2)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=42)
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+
+    construct = sub.add_parser("construct", help="bulk from_records/from_csv vs the per-object constructor")
+    construct.add_argument("--rows", type=int, default=2_000_000)
+    construct.add_argument("--invalid-fraction", type=float, default=0.01)
+    construct.set_defaults(run=bench_construct)
+
+    args = parser.parse_args(argv)
+    print(json.dumps(args.run(args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,24 @@
+import contextlib
+import csv
+import gc
+import os
 import re
+from collections import deque
+from itertools import compress, repeat, starmap
+
+import numpy as np
 
 
 class Product:
     VALID_CATEGORIES = ['Electronics', 'Clothing', 'Books', 'Home', 'Sports']
+    CATEGORY_SET = frozenset(VALID_CATEGORIES)
+    NAME_PATTERN = re.compile(r'^[a-zA-Z0-9\s\-]+$')
+    FIELDS = ('name', 'base_price', 'discount_percent', 'stock_quantity', 'category')
+    DEFAULTS = {'discount_percent': 0, 'stock_quantity': 0, 'category': 'Electronics'}
+    # Field values first (FIELDS order), then the memoized derived values,
+    # which are None until first read and reset by the setters they depend on.
+    __slots__ = ('_name', '_base_price', '_discount_percent', '_stock_quantity', '_category',
+                 '_final_price', '_savings_amount', '_availability_status', '_summary')
     
     def __init__(self, name, base_price, discount_percent=0, stock_quantity=0, category='Electronics'):
         self.name = name
@@ -20,10 +36,11 @@ class Product:
         if len(value) < 3 or len(value) > 50:
             raise ValueError("Name must be between 3 and 50 characters")
         
-        if not re.match(r'^[a-zA-Z0-9\s\-]+$', value):
+        if not self.NAME_PATTERN.match(value):
             raise ValueError("Name can only contain letters, numbers, spaces, and hyphens")
         
         self._name = value
+        self._summary = None
     
     @property
     def base_price(self):
@@ -38,6 +55,7 @@ class Product:
             raise ValueError("Base price cannot exceed $50,000")
         
         self._base_price = float(value)
+        self._final_price = self._savings_amount = self._summary = None
     
     @property
     def discount_percent(self):
@@ -49,6 +67,7 @@ class Product:
             raise ValueError("Discount percent must be between 0 and 75")
         
         self._discount_percent = round(float(value), 2)
+        self._final_price = self._savings_amount = self._summary = None
     
     @property
     def stock_quantity(self):
@@ -63,6 +82,7 @@ class Product:
             raise ValueError("Stock quantity cannot exceed 10,000 units")
         
         self._stock_quantity = value
+        self._availability_status = self._summary = None
     
     @property
     def category(self):
@@ -70,34 +90,331 @@ class Product:
     
     @category.setter
     def category(self, value): 
-        if value not in self.VALID_CATEGORIES:
+        if value not in self.CATEGORY_SET:
             raise ValueError(f"Category must be one of: {', '.join(self.VALID_CATEGORIES)}")
         
         self._category = value
+        self._summary = None
     
     @property
     def final_price(self):
-        discount_amount = (self._base_price * self._discount_percent) / 100
-        return round(self._base_price - discount_amount, 2)
+        if self._final_price is None:
+            discount_amount = (self._base_price * self._discount_percent) / 100
+            self._final_price = round(self._base_price - discount_amount, 2)
+        return self._final_price
     
     @property
     def savings_amount(self):
-        return round((self._base_price * self._discount_percent) / 100, 2)
+        if self._savings_amount is None:
+            self._savings_amount = round((self._base_price * self._discount_percent) / 100, 2)
+        return self._savings_amount
     
     @property
     def availability_status(self):
-        if self._stock_quantity == 0:
-            return "Out of Stock"
-        elif self._stock_quantity < 10:
-            return "Low Stock"
-        else:
-            return "In Stock"
+        if self._availability_status is None:
+            if self._stock_quantity == 0:
+                self._availability_status = "Out of Stock"
+            elif self._stock_quantity < 10:
+                self._availability_status = "Low Stock"
+            else:
+                self._availability_status = "In Stock"
+        return self._availability_status
     
     @property
     def product_summary(self):
-        return (f"{self._name} | {self._category} | "
-                f"${self.final_price:.2f} (${self._base_price:.2f} - {self._discount_percent}% off) | "
-                f"{self.availability_status} ({self._stock_quantity} units)")
+        if self._summary is None:
+            self._summary = (f"{self._name} | {self._category} | "
+                             f"${self.final_price:.2f} (${self._base_price:.2f} - {self._discount_percent}% off) | "
+                             f"{self.availability_status} ({self._stock_quantity} units)")
+        return self._summary
+
+    @classmethod
+    def from_records(cls, records, errors=None):
+        # Bulk constructor for feeds. records are tuples in FIELDS order (trailing
+        # fields optional) or dicts keyed by field name. Whole columns are checked
+        # at once with the setter rules; invalid rows raise one ProductBatchError
+        # listing every problem, or, when an errors list is given, are appended to
+        # it as (row, message) and skipped.
+        defaults = tuple(cls.DEFAULTS.get(field) for field in cls.FIELDS)
+        width = len(cls.FIELDS)
+        with gc_paused():
+            rows = records if isinstance(records, list) else list(records)
+            # Feeds are usually uniform full-width tuples, which transpose as is.
+            if not set(map(type, rows)) <= {tuple, list} or set(map(len, rows)) - {width}:
+                rows = [
+                    tuple(record.get(field, default) for field, default in zip(cls.FIELDS, defaults))
+                    if isinstance(record, dict) else
+                    (record if len(record) == width else tuple(record) + defaults[len(record):])
+                    for record in rows
+                ]
+            columns = dict(zip(cls.FIELDS, zip(*rows))) if rows else {field: () for field in cls.FIELDS}
+            return cls._from_columns(columns, errors)
+
+    @classmethod
+    def from_csv(cls, source, errors=None):
+        # source is a path or an open text file whose header names the fields;
+        # discount_percent, stock_quantity and category columns may be omitted.
+        opened = open(source, newline='') if isinstance(source, (str, os.PathLike)) else contextlib.nullcontext(source)
+        with opened as f, gc_paused():
+            reader = csv.reader(f)
+            header = next(reader, None) or []
+            rows = list(reader)
+        missing = [field for field in ('name', 'base_price') if field not in header]
+        if missing:
+            raise ValueError(f"CSV is missing required columns: {', '.join(missing)}")
+
+        malformed = [(row, f"Expected {len(header)} fields, got {len(values)}")
+                     for row, values in enumerate(rows) if len(values) != len(header)]
+        if malformed:
+            # Keep row numbers stable with blank placeholders for ragged rows.
+            blank = [''] * len(header)
+            rows = [values if len(values) == len(header) else blank for values in rows]
+        with gc_paused():
+            values_by_column = dict(zip(header, zip(*rows))) if rows else {}
+            columns = {field: values_by_column.get(field, [cls.DEFAULTS.get(field)] * len(rows))
+                       for field in cls.FIELDS}
+            return cls._from_columns(columns, errors, malformed)
+
+    @classmethod
+    def _from_columns(cls, columns, errors=None, malformed=None):
+        # malformed: (row, message) for rows that could not be split into fields;
+        # their blank placeholder values are not reported again.
+        malformed = list(malformed or [])
+        skip = {row for row, _ in malformed}
+        found = []
+        names = columns['name']
+        base_prices = to_column(columns['base_price'], np.float64, "Base price must be a number", found)
+        discounts = to_column(columns['discount_percent'], np.float64, "Discount percent must be a number", found)
+        stocks = to_column(columns['stock_quantity'], np.int64, "Stock quantity must be a whole number", found)
+        codes, category_errors = category_codes(columns['category'])
+        found += validate_names(names) + category_errors
+        found += validate_columns(base_prices, discounts, stocks)
+        found = malformed + [error for error in found if error[0] not in skip] if skip else found
+        found.sort(key=lambda error: error[0])
+
+        if found:
+            if errors is None:
+                raise ProductBatchError(found)
+            errors.extend(found)
+
+        # Values are already validated, so fill the slots directly: one C-level
+        # map per field instead of five setter calls per product.
+        columns = [names, base_prices.tolist(), round_half_even(discounts).tolist(), stocks.tolist(),
+                   [cls.VALID_CATEGORIES[code] for code in codes.tolist()]]
+        if found:
+            keep = np.ones(len(names), dtype=bool)
+            keep[[row for row, _ in found]] = False
+            columns = [list(compress(column, keep.tolist())) for column in columns]
+        if cls is not Product:
+            # Subclasses may add slots or run their own __init__, so they take the regular path.
+            return list(starmap(cls, zip(*columns)))
+        products = list(map(object.__new__, repeat(Product, len(columns[0]))))
+        for slot, column in zip(Product.__slots__, columns + [repeat(None)] * 4):
+            deque(map(getattr(Product, slot).__set__, products, column), maxlen=0)
+        return products
+
+
+def round_half_even(values, decimals=2):
+    # np.round scales by 10**decimals first, so values sitting on a rounding
+    # tie can land on the other side of it. Those rows are re-rounded with
+    # round(), which matches the per-object properties exactly.
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, decimals)
+    scaled = values * 10 ** decimals
+    ties = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    for row in ties:
+        rounded[row] = round(float(values[row]), decimals)
+    return rounded
+
+
+@contextlib.contextmanager
+def gc_paused():
+    # Bulk loads allocate millions of tracked objects and nothing cyclic; with
+    # the collector on, each allocation burst triggers full-heap scans.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class ProductBatchError(ValueError):
+    def __init__(self, errors):
+        self.errors = errors  # (row, message) pairs in row order
+        row, message = errors[0]
+        super().__init__(f"{len(errors)} invalid row(s); first: Row {row}: {message}")
+
+
+def to_column(values, dtype, message, found):
+    # Fast path parses the whole column in C; on failure find the bad rows.
+    # Integer columns go through float64 so 2.5 is rejected instead of truncated.
+    try:
+        if isinstance(values, np.ndarray) and values.dtype.kind in "biuf":
+            column = values.astype(np.float64)
+        else:
+            column = np.fromiter(map(float, values), np.float64, len(values))
+    except (TypeError, ValueError):
+        # Unparseable rows become nan, which no range check rejects a second time.
+        column = np.full(len(values), np.nan)
+        unparsed = []
+        for row, value in enumerate(values):
+            try:
+                column[row] = float(value)
+            except (TypeError, ValueError):
+                unparsed.append(row)
+                found.append((row, message))
+        if np.issubdtype(dtype, np.integer):
+            column[unparsed] = 0
+    if np.issubdtype(dtype, np.integer):
+        fractional = np.flatnonzero(column != np.floor(column))  # also catches nan and inf
+        found.extend((int(row), message) for row in fractional)
+        column[fractional] = 0
+    return column.astype(dtype)
+
+
+NAME_SEPARATOR = "\x00"  # not an allowed name character, so it can join a whole column
+INVALID_NAME_CHAR = re.compile(r'[^a-zA-Z0-9\s\-\x00]')
+
+
+def validate_names(names):
+    # Checks the whole column with one length pass and one regex scan over the
+    # joined names; rows are only inspected one by one when something fails.
+    n = len(names)
+    try:
+        joined = NAME_SEPARATOR.join(names)
+    except TypeError:  # non-string names
+        return check_names(names, range(n))
+    if joined.count(NAME_SEPARATOR) != max(n - 1, 0):  # a separator inside a name
+        return check_names(names, range(n))
+    lengths = np.fromiter(map(len, names), np.int64, n)
+    suspects = set(np.flatnonzero((lengths < 3) | (lengths > 50)).tolist())
+    bad_chars = [match.start() for match in INVALID_NAME_CHAR.finditer(joined)]
+    if bad_chars:
+        ends = np.cumsum(lengths + 1)  # offset just past each name's separator
+        suspects.update(np.searchsorted(ends, bad_chars, side='right').tolist())
+    return check_names(names, sorted(suspects))
+
+
+def check_names(names, rows):
+    errors = []
+    for row in rows:
+        name = names[row]
+        if not isinstance(name, str) or len(name) < 3 or len(name) > 50:
+            errors.append((row, "Name must be between 3 and 50 characters"))
+        elif not Product.NAME_PATTERN.match(name):
+            errors.append((row, "Name can only contain letters, numbers, spaces, and hyphens"))
+    return errors
+
+
+def validate_columns(base_prices=None, discount_percents=None, stock_quantities=None):
+    # The Product setter rules and messages, one vectorized check per rule.
+    errors = []
+
+    def reject(bad, message):
+        errors.extend((int(row), message) for row in np.flatnonzero(bad))
+
+    if base_prices is not None:
+        reject(base_prices <= 0, "Base price must be positive")
+        reject(base_prices > 50000, "Base price cannot exceed $50,000")
+    if discount_percents is not None:
+        reject((discount_percents < 0) | (discount_percents > 75), "Discount percent must be between 0 and 75")
+    if stock_quantities is not None:
+        reject(stock_quantities < 0, "Stock quantity cannot be negative")
+        reject(stock_quantities > 10000, "Stock quantity cannot exceed 10,000 units")
+    return errors
+
+
+def category_codes(categories):
+    lookup = {category: code for code, category in enumerate(Product.VALID_CATEGORIES)}
+    try:
+        codes = np.fromiter(map(lookup.get, categories, repeat(-1)), np.int8, len(categories))
+    except TypeError:  # unhashable values
+        codes = np.array([lookup.get(c, -1) if isinstance(c, str) else -1 for c in categories], dtype=np.int8)
+    message = f"Category must be one of: {', '.join(Product.VALID_CATEGORIES)}"
+    unknown = np.flatnonzero(codes < 0)
+    codes[unknown] = 0
+    return codes, [(int(row), message) for row in unknown]
+
+
+class ProductCatalog:
+    # Column-wise Product storage for bulk repricing and feed exports. Every
+    # column is validated with the same rules (and messages) as the Product
+    # setters, prefixed with the first offending row.
+    AVAILABILITY_LABELS = np.array(["Out of Stock", "Low Stock", "In Stock"], dtype=object)
+
+    def __init__(self, names, base_prices, discount_percents=None, stock_quantities=None, categories=None):
+        n = len(names)
+        self.names = np.asarray(names, dtype=object)
+        self._raise_first(validate_names(self.names))
+
+        self.base_prices = np.zeros(n)
+        self.discount_percents = np.zeros(n)
+        self.stock_quantities = np.zeros(n, dtype=np.int64)
+        self.update(base_prices,
+                    np.zeros(n) if discount_percents is None else discount_percents,
+                    np.zeros(n) if stock_quantities is None else stock_quantities)
+
+        self.category_codes, errors = category_codes(["Electronics"] * n if categories is None else categories)
+        self._raise_first(errors)
+
+    @classmethod
+    def from_products(cls, products):
+        return cls([p.name for p in products], [p.base_price for p in products],
+                   [p.discount_percent for p in products], [p.stock_quantity for p in products],
+                   [p.category for p in products])
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, row):
+        return Product(self.names[row], float(self.base_prices[row]), float(self.discount_percents[row]),
+                       int(self.stock_quantities[row]), self.category(row))
+
+    def category(self, row):
+        return Product.VALID_CATEGORIES[self.category_codes[row]]
+
+    @staticmethod
+    def _raise_first(errors):
+        if errors:
+            row, message = min(errors, key=lambda error: error[0])
+            raise ValueError(f"Row {row}: {message}")
+
+    def update(self, base_prices=None, discount_percents=None, stock_quantities=None, rows=None):
+        # Validates every given column before assigning any, so a bad batch
+        # leaves the catalog untouched. rows selects a subset (index array or mask).
+        rows = slice(None) if rows is None else rows
+        base_prices = None if base_prices is None else np.asarray(base_prices, dtype=np.float64)
+        discount_percents = None if discount_percents is None else np.asarray(discount_percents, dtype=np.float64)
+        errors = []
+        if stock_quantities is not None:
+            stock_quantities = to_column(np.atleast_1d(stock_quantities), np.int64,
+                                         "Stock quantity must be a whole number", errors)
+        self._raise_first(errors + validate_columns(base_prices, discount_percents, stock_quantities))
+        if discount_percents is not None:
+            discount_percents = round_half_even(discount_percents)
+
+        if base_prices is not None:
+            self.base_prices[rows] = base_prices
+        if discount_percents is not None:
+            self.discount_percents[rows] = discount_percents
+        if stock_quantities is not None:
+            self.stock_quantities[rows] = stock_quantities
+
+    def savings_amounts(self):
+        return round_half_even((self.base_prices * self.discount_percents) / 100)
+
+    def final_prices(self):
+        discount_amounts = (self.base_prices * self.discount_percents) / 100
+        return round_half_even(self.base_prices - discount_amounts)
+
+    def availability_codes(self):
+        # 0 = Out of Stock, 1 = Low Stock, 2 = In Stock
+        return np.where(self.stock_quantities == 0, 0, np.where(self.stock_quantities < 10, 1, 2)).astype(np.int8)
+
+    def availability_statuses(self):
+        return self.AVAILABILITY_LABELS.take(self.availability_codes())
 
 if __name__ == "__main__":
     # Test Case 1
@@ -141,4 +458,131 @@ if __name__ == "__main__":
     assert "1299.99" in product.product_summary
     assert "Low Stock" in product.product_summary
 
+    # Test Case 5: Columnar catalog matches the per-object properties
+    products = [
+        Product("Gaming Laptop", 1299.99, 15.5, 25, "Electronics"),
+        Product("Wool Scarf", 19.99, 0, 0, "Clothing"),
+        Product("Field Guide", 24.5, 33.33, 4, "Books"),
+        Product("Desk Lamp", 0.01, 50, 10, "Home"),
+        Product("Tennis Racket", 50000, 75, 10000, "Sports"),
+    ]
+    catalog = ProductCatalog.from_products(products)
+    assert len(catalog) == 5 and catalog.category(2) == "Books"
+    assert catalog.final_prices().tolist() == [p.final_price for p in products]
+    assert catalog.savings_amounts().tolist() == [p.savings_amount for p in products]
+    assert catalog.availability_statuses().tolist() == [p.availability_status for p in products]
+    assert catalog[2].product_summary == products[2].product_summary
+
+    # Rounding ties: np.round alone disagrees with round() on values like 0.125 and 2.675
+    assert round_half_even([0.125, 2.675, 1.005, 0.5]).tolist() == [round(v, 2) for v in [0.125, 2.675, 1.005, 0.5]]
+
+    # Test Case 6: Bulk updates apply the setter rules atomically
+    catalog.update(discount_percents=[20.567, 10], rows=[0, 1])
+    assert catalog.discount_percents[0] == 20.57
+    assert abs(catalog.final_prices()[0] - 1032.59) < 0.01
+    try:
+        catalog.update(base_prices=[10, -5, 20], stock_quantities=[1, 2, 3], rows=[0, 1, 2])
+        assert False, "Should raise ValueError"
+    except ValueError as e:
+        assert str(e) == "Row 1: Base price must be positive"
+    assert catalog.base_prices[0] == 1299.99 and catalog.stock_quantities[0] == 25
+    try:
+        catalog.update(stock_quantities=[3, 2.5], rows=[0, 1])
+        assert False, "Should raise ValueError"
+    except ValueError as e:
+        assert str(e) == "Row 1: Stock quantity must be a whole number"
+    assert catalog.stock_quantities[:2].tolist() == [p.stock_quantity for p in products[:2]]
+    catalog.update(stock_quantities=7, rows=[4])
+    assert catalog.stock_quantities[4] == 7
+    try:
+        ProductCatalog(["Gaming Laptop", "AB"], [10, 20])
+        assert False, "Should raise ValueError"
+    except ValueError as e:
+        assert "Row 1" in str(e) and "between 3 and 50 characters" in str(e)
+    try:
+        ProductCatalog(["Gaming Laptop"], [10], categories=["Toys"])
+        assert False, "Should raise ValueError"
+    except ValueError:
+        pass
+
+    # Test Case 7: Bulk construction from records and CSV
+    import io
+
+    records = [
+        ("Gaming Laptop", 1299.99, 15.5, 25, "Electronics"),
+        {"name": "Wool Scarf", "base_price": 19.99, "category": "Clothing"},
+        ("Field Guide", 24.5, 20.567),
+    ]
+    bulk = Product.from_records(records)
+    expected = [Product(*records[0]), Product("Wool Scarf", 19.99, category="Clothing"), Product(*records[2])]
+    assert [p.product_summary for p in bulk] == [p.product_summary for p in expected]
+    assert bulk[2].discount_percent == 20.57 and bulk[1].stock_quantity == 0
+    try:
+        bulk[0].nickname = "laptop"
+        assert False, "Product should use __slots__"
+    except AttributeError:
+        pass
+
+    feed = io.StringIO(
+        "name,base_price,discount_percent,stock_quantity,category\n"
+        "Gaming Laptop,1299.99,15.5,25,Electronics\n"
+        "AB,10,0,1,Books\n"
+        "Desk Lamp,-5,80,2.5,Toys\n"
+        "Tennis Racket,199,10,4,Sports\n"
+        "Short Row,5\n"
+    )
+    try:
+        Product.from_csv(feed)
+        assert False, "Should raise ProductBatchError"
+    except ProductBatchError as e:
+        reported = e.errors
+        rows = [row for row, _ in reported]
+        assert rows[0] == 1 and rows.count(2) == 4 and rows.count(4) == 1 and 0 not in rows and 3 not in rows
+        assert "Base price must be positive" in [message for row, message in e.errors if row == 2]
+
+    feed.seek(0)
+    errors = []
+    valid = Product.from_csv(feed, errors=errors)
+    assert [p.name for p in valid] == ["Gaming Laptop", "Tennis Racket"]
+    assert valid[1].availability_status == "Low Stock" and errors == reported
+
+    class TaggedProduct(Product):
+        __slots__ = ('tag',)
+
+        def __init__(self, *args, tag='new', **kwargs):
+            super().__init__(*args, **kwargs)
+            self.tag = tag
+
+    class ClearanceProduct(Product):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.clearance = True
+
+    tagged = TaggedProduct.from_records(records)
+    assert all(type(p) is TaggedProduct and p.tag == 'new' for p in tagged)
+    assert [p.product_summary for p in tagged] == [p.product_summary for p in expected]
+    clearance = ClearanceProduct.from_records(records[:1])
+    assert clearance[0].clearance and clearance[0].name == "Gaming Laptop"
+
+    # Test Case 8: Derived properties are memoized until a dependency changes
+    product = Product("Desk Lamp", 40, 10, 5, "Home")
+    summary = product.product_summary
+    assert product.product_summary is summary and product.final_price == 36.0
+    product.stock_quantity = 50
+    assert product._final_price == 36.0 and product._summary is None  # price entries survive a stock change
+    assert product.product_summary == "Desk Lamp | Home | $36.00 ($40.00 - 10.0% off) | In Stock (50 units)"
+    product.discount_percent = 25
+    assert product._availability_status == "In Stock" and product._final_price is None
+    assert product.final_price == 30.0 and product.savings_amount == 10.0
+    product.name = "Floor Lamp"
+    product.category = "Electronics"
+    assert product.product_summary.startswith("Floor Lamp | Electronics | $30.00")
+    try:
+        product.base_price = 0
+        assert False, "Should raise ValueError"
+    except ValueError:
+        assert product.final_price == 30.0  # rejected values leave the caches intact
+    lamp = Product.from_records([("Desk Lamp", 40, 10, 5, "Home")])[0]
+    assert lamp._summary is None and lamp.product_summary == Product("Desk Lamp", 40, 10, 5, "Home").product_summary
+
     print("✅ All tests passed!")
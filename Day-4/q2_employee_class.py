@@ -1,32 +1,116 @@
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from itertools import islice
+import csv
+import os
 import re
+import threading
+import time
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # not on Windows: only in-process allocators there
+    fcntl = None
+
+HireResult = namedtuple("HireResult", "line employee error")  # one per input row; exactly one of employee/error is set
+
+
+class IdAllocator:
+    # Hands out employee numbers. Without a path the counter lives in this
+    # process behind a lock. With a path, the next free number is kept in that
+    # file and each process reserves blocks of block_size under an exclusive
+    # flock, one file round trip per block, then numbers locally.
+    def __init__(self, path=None, block_size=1000, start=1):
+        if path is not None and fcntl is None:
+            raise RuntimeError("File-backed id allocation needs fcntl (POSIX)")
+        self.path = path
+        self.block_size = block_size
+        self.start = start
+        self.next_number = start  # in-process counter, used when path is None
+        self.lock = threading.Lock()
+        self.block = (0, 0)  # [next, end) reserved from the file by this process
+        self.pid = os.getpid()
+        self.year = None
+        self.year_ends = 0.0  # timestamp of the next New Year, when self.year goes stale
+
+    def reserve(self, count):
+        # One atomic step: the first of `count` consecutive numbers that no other
+        # thread or process will receive.
+        if self.path is None:
+            with self.lock:
+                first = self.next_number
+                self.next_number += count
+                return first
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)  # released when fd is closed
+            raw = os.pread(fd, 32, 0)
+            first = int(raw) if raw.strip() else self.start
+            data = b"%d\n" % (first + count)
+            os.pwrite(fd, data, 0)
+            os.ftruncate(fd, len(data))
+        finally:
+            os.close(fd)
+        return first
+
+    def allocate(self):
+        # -> (year, number) for a single new id
+        with self.lock:
+            if self.path is None:
+                number = self.next_number
+                self.next_number = number + 1
+            else:
+                if self.pid != os.getpid():  # forked child: the inherited block is the parent's
+                    self.pid = os.getpid()
+                    self.block = (0, 0)
+                number, end = self.block
+                if number == end:
+                    number = self.reserve(self.block_size)
+                    end = number + self.block_size
+                self.block = (number + 1, end)
+        if time.time() >= self.year_ends:  # cheaper than datetime.now() on every id
+            now = datetime.now()
+            self.year = now.year
+            self.year_ends = datetime(now.year + 1, 1, 1).timestamp()
+        return self.year, number
+
 
 class Employee:
     company_name = "GlobalTech Solutions"
     total_employees = 0
     departments = {"Engineering": 0, "Sales": 0, "HR": 0, "Marketing": 0}
     tax_rates = {"USA": 0.22, "India": 0.18, "UK": 0.25}
-    next_employee_id = 1
+    id_allocator = IdAllocator()  # swap for IdAllocator(path) when several processes hire
+    EMAIL_PATTERN = re.compile(r"^[\w\.-]+@[\w\.-]+\.\w+$")
+    EMAIL_LINES = re.compile(EMAIL_PATTERN.pattern, re.MULTILINE)
+    CSV_FIELDS = ("name", "department", "base_salary", "country", "email")
 
-    def __init__(self, name, department, base_salary, country, email):
-        self.employee_id = Employee.generate_employee_id()
+    def __init__(self, name, department, base_salary, country, email, *, employee_id=None, hire_date=None,
+                 counted=False):
+        # Batch hiring passes ids it reserved up front, one hire date per batch,
+        # and counted=True because it updates the class counters once per batch.
+        self.employee_id = Employee.generate_employee_id() if employee_id is None else employee_id
         self.name = name
         self.department = department
         self.base_salary = base_salary
         self.country = country
         self.email = email
-        self.hire_date = datetime.now()
+        self.hire_date = datetime.now() if hire_date is None else hire_date
         self.performance_ratings = []
+        self.rating_listeners = []  # callables(employee, rating) run after each accepted rating
 
-        Employee.total_employees += 1
-        if department in Employee.departments:
-            Employee.departments[department] += 1
+        if not counted:
+            Employee.total_employees += 1
+            if department in Employee.departments:
+                Employee.departments[department] += 1
 
     # --------- Static Methods ----------
     @staticmethod
     def validate_email(email):
-        pattern = r"^[\w\.-]+@[\w\.-]+\.\w+$"
-        return re.match(pattern, email) is not None
+        return Employee.EMAIL_PATTERN.match(email) is not None
 
     @staticmethod
     def calculate_tax(salary, country):
@@ -39,10 +123,8 @@ class Employee:
 
     @staticmethod
     def generate_employee_id():
-        year = datetime.now().year
-        emp_id = f"EMP-{year}-{Employee.next_employee_id:04d}"
-        Employee.next_employee_id += 1
-        return emp_id
+        year, number = Employee.id_allocator.allocate()
+        return f"EMP-{year}-{number:04d}"
 
     # --------- Class Methods ----------
     @classmethod
@@ -60,13 +142,89 @@ class Employee:
 
     @classmethod
     def hire_bulk_employees(cls, employee_list):
-        for line in employee_list:
-            emp = cls.from_csv_data(line)
+        return list(cls.hire_stream(csv.reader(employee_list)))
+
+    @classmethod
+    def hire_from_csv(cls, source, batch_size=10000, skip_header=False):
+        # source is a path or any iterable of CSV lines (e.g. an open file).
+        # Rows are read lazily, so a 10^6 row file never sits in memory.
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, newline="") as f:
+                yield from cls.hire_from_csv(f, batch_size, skip_header)
+            return
+        rows = csv.reader(source)
+        if skip_header:
+            next(rows, None)
+        yield from cls.hire_stream(rows, batch_size, start_line=2 if skip_header else 1)
+
+    @classmethod
+    def hire_stream(cls, rows, batch_size=10000, start_line=1):
+        # rows: iterable of field lists. Yields a HireResult per row, in order.
+        rows = iter(rows)
+        line = start_line
+        while batch := list(islice(rows, batch_size)):
+            yield from cls._hire_batch(batch, line)
+            line += len(batch)
+
+    @classmethod
+    def _hire_batch(cls, batch, first_line):
+        # Each check runs over a whole column; rows are only walked one by one
+        # to pinpoint failures. The first problem found for a row is reported.
+        errors = {}  # batch index -> message
+        width = len(cls.CSV_FIELDS)
+        if set(map(len, batch)) != {width}:
+            for index, fields in enumerate(batch):
+                if len(fields) != width:
+                    errors[index] = f"Expected {width} fields, got {len(fields)}"
+            batch = [fields if len(fields) == width else [""] * width for fields in batch]
+        names, depts, salaries, countries, emails = (list(map(str.strip, column)) for column in zip(*batch))
+
+        try:
+            salaries = list(map(float, salaries))
+        except ValueError:
+            parsed = []
+            for index, salary in enumerate(salaries):
+                try:
+                    parsed.append(float(salary))
+                except ValueError:
+                    errors.setdefault(index, f"Invalid salary: {salary!r}")
+                    parsed.append(0.0)
+            salaries = parsed
+        if not set(depts) <= Employee.departments.keys():
+            for index, dept in enumerate(depts):
+                if dept not in Employee.departments:
+                    errors.setdefault(index, f"Unknown department: {dept!r}")
+        # One multiline scan: every email is valid iff each line yields a match.
+        joined = "\n".join(emails)
+        if joined.count("\n") != len(emails) - 1 or len(cls.EMAIL_LINES.findall(joined)) != len(emails):
+            for index, email in enumerate(emails):
+                if not cls.EMAIL_PATTERN.match(email):
+                    errors.setdefault(index, f"Invalid email: {email!r}")
+
+        accepted = [index for index in range(len(batch)) if index not in errors] if errors else range(len(batch))
+        # Ids, hire date and counters are settled once for the whole batch.
+        hire_date = datetime.now()
+        prefix = f"EMP-{hire_date.year}-"
+        first_id = Employee.id_allocator.reserve(len(accepted))
+        Employee.total_employees += len(accepted)
+        for dept, count in Counter(depts[index] for index in accepted).items():
+            Employee.departments[dept] += count
+
+        results = [None] * len(batch)
+        for index, message in errors.items():
+            results[index] = HireResult(first_line + index, None, message)
+        for offset, index in enumerate(accepted):
+            emp = cls(names[index], depts[index], salaries[index], countries[index], emails[index],
+                      employee_id=f"{prefix}{first_id + offset:04d}", hire_date=hire_date, counted=True)
+            results[index] = HireResult(first_line + index, emp, None)
+        return results
 
     # --------- Instance Methods ----------
     def add_performance_rating(self, rating):
         if 1 <= rating <= 5:
             self.performance_ratings.append(rating)
+            for listener in self.rating_listeners:
+                listener(self, rating)
 
     def get_average_performance(self):
         if not self.performance_ratings:
@@ -84,6 +242,207 @@ class Employee:
         return self.get_average_performance() > 3.5 and self.get_years_of_service() > 1
 
 
+class EmployeeRegistry:
+    # Holds the employee objects and keeps every index and aggregate current
+    # as employees are added, removed, rated or updated, so queries never scan
+    # the whole workforce.
+    BONUS_RATING = 3.5  # is_eligible_for_bonus thresholds
+    BONUS_SERVICE = timedelta(days=366)  # get_years_of_service() > 1 needs 366 whole days
+
+    def __init__(self, employees=()):
+        self.by_id = {}
+        self.by_department = {}  # department -> set of employee ids
+        self.by_country = {}     # country -> set of employee ids
+        self.rating_totals = {}  # employee id -> [count, sum] of performance ratings
+        self.high_performers = set()  # ids whose average rating is above BONUS_RATING
+        self.department_totals = {}  # department -> {"count", "salary_total", "rating_count", "rating_sum"}
+        self.add_many(employees)
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __contains__(self, employee_id):
+        return employee_id in self.by_id
+
+    def get(self, employee_id):
+        return self.by_id.get(employee_id)
+
+    def add(self, emp):
+        if emp.employee_id in self.by_id:
+            raise ValueError(f"Employee {emp.employee_id} is already registered")
+        self.by_id[emp.employee_id] = emp
+        self.rating_totals[emp.employee_id] = [len(emp.performance_ratings), sum(emp.performance_ratings)]
+        self._index(emp)
+        emp.rating_listeners.append(self._on_rating)
+
+    def add_many(self, employees):
+        for emp in employees:
+            self.add(emp)
+
+    def remove(self, employee_id):
+        emp = self.by_id.pop(employee_id)
+        self._unindex(emp)
+        del self.rating_totals[employee_id]
+        emp.rating_listeners.remove(self._on_rating)
+        return emp
+
+    def update(self, emp, **changes):
+        # Route changes to indexed fields (department, country, base_salary) through here.
+        self._unindex(emp)
+        for attribute, value in changes.items():
+            setattr(emp, attribute, value)
+        self._index(emp)
+
+    def _index(self, emp):
+        eid = emp.employee_id
+        self.by_department.setdefault(emp.department, set()).add(eid)
+        self.by_country.setdefault(emp.country, set()).add(eid)
+        count, total = self.rating_totals[eid]
+        if count and total / count > self.BONUS_RATING:
+            self.high_performers.add(eid)
+        totals = self.department_totals.setdefault(
+            emp.department, {"count": 0, "salary_total": 0.0, "rating_count": 0, "rating_sum": 0.0})
+        totals["count"] += 1
+        totals["salary_total"] += emp.base_salary
+        totals["rating_count"] += count
+        totals["rating_sum"] += total
+
+    def _unindex(self, emp):
+        eid = emp.employee_id
+        self.by_department[emp.department].discard(eid)
+        self.by_country[emp.country].discard(eid)
+        self.high_performers.discard(eid)
+        count, total = self.rating_totals[eid]
+        totals = self.department_totals[emp.department]
+        totals["count"] -= 1
+        totals["salary_total"] -= emp.base_salary
+        totals["rating_count"] -= count
+        totals["rating_sum"] -= total
+
+    def _on_rating(self, emp, rating):
+        eid = emp.employee_id
+        rolling = self.rating_totals[eid]
+        rolling[0] += 1
+        rolling[1] += rating
+        if rolling[1] / rolling[0] > self.BONUS_RATING:
+            self.high_performers.add(eid)
+        else:
+            self.high_performers.discard(eid)
+        totals = self.department_totals[emp.department]
+        totals["rating_count"] += 1
+        totals["rating_sum"] += rating
+
+    def get_average_performance(self, employee_id):
+        count, total = self.rating_totals[employee_id]
+        return total / count if count else 0
+
+    def find(self, department=None, country=None, bonus_eligible=None, now=None):
+        # Intersects the matching index sets, smallest first; only the service
+        # length check for bonus eligibility looks at individual employees.
+        sets = []
+        if department is not None:
+            sets.append(self.by_department.get(department, set()))
+        if country is not None:
+            sets.append(self.by_country.get(country, set()))
+        if bonus_eligible:
+            sets.append(self.high_performers)
+        if sets:
+            sets.sort(key=len)
+            ids = sets[0].intersection(*sets[1:])
+        else:
+            ids = self.by_id.keys()
+        matches = [self.by_id[eid] for eid in ids]
+        if bonus_eligible is not None:
+            cutoff = (now or datetime.now()) - self.BONUS_SERVICE
+            if bonus_eligible:
+                matches = [emp for emp in matches if emp.hire_date <= cutoff]
+            else:
+                matches = [emp for emp in matches
+                           if emp.employee_id not in self.high_performers or emp.hire_date > cutoff]
+        return sorted(matches, key=lambda emp: (len(emp.employee_id), emp.employee_id))  # id order past 9999
+
+    def get_department_stats(self):
+        return {
+            dept: {
+                "count": totals["count"],
+                "salary_total": totals["salary_total"],
+                "average_salary": totals["salary_total"] / totals["count"],
+                "average_rating": totals["rating_sum"] / totals["rating_count"] if totals["rating_count"] else 0,
+            }
+            for dept, totals in self.department_totals.items() if totals["count"] > 0
+        }
+
+
+class Payroll:
+    # Column snapshot of a workforce for payroll runs. Countries and
+    # departments become integer codes; tax rates are looked up per run from
+    # Employee.tax_rates, so set_tax_rate changes apply to the next run.
+    def __init__(self, employees):
+        employees = list(employees)
+        self.employee_ids = [emp.employee_id for emp in employees]
+        self.countries, self.country_codes = self._encode([emp.country for emp in employees])
+        self.departments, self.department_codes = self._encode([emp.department for emp in employees])
+        self.salaries = np.fromiter((emp.base_salary for emp in employees), np.float64, len(employees))
+
+    @staticmethod
+    def _encode(values):
+        codes = {}
+        column = np.fromiter((codes.setdefault(value, len(codes)) for value in values), np.int32, len(values))
+        return list(codes), column
+
+    def __len__(self):
+        return len(self.salaries)
+
+    def run(self, workers=1, chunk_size=250_000):
+        # Per-employee tax is salary * rate and net is salary - tax, the same
+        # two operations as calculate_tax/calculate_net_salary, so each value is
+        # identical to the per-object result. Large runs can fan chunks out to
+        # worker processes; chunks are pickled both ways, so any start method works.
+        rates = np.array([Employee.tax_rates.get(country, 0) for country in self.countries], dtype=np.float64)
+        chunks = [(self.salaries[start:start + chunk_size], self.country_codes[start:start + chunk_size],
+                   self.department_codes[start:start + chunk_size], rates, len(self.departments))
+                  for start in range(0, len(self), chunk_size)]
+        if workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(workers) as pool:
+                parts = list(pool.map(_payroll_chunk, chunks))
+        else:
+            parts = list(map(_payroll_chunk, chunks))
+
+        tax = np.concatenate([part[0] for part in parts]) if parts else np.zeros(0)
+        net = np.concatenate([part[1] for part in parts]) if parts else np.zeros(0)
+        by_department = sum((part[2] for part in parts), np.zeros((4, len(self.departments))))
+        by_country = sum((part[3] for part in parts), np.zeros((4, len(self.countries))))
+        return {
+            "employee_ids": self.employee_ids,
+            "gross": self.salaries,
+            "tax": tax,
+            "net": net,
+            "by_department": self._summarize(self.departments, by_department),
+            "by_country": self._summarize(self.countries, by_country),
+            "totals": {"count": len(self), "gross": float(self.salaries.sum()),
+                       "tax": float(tax.sum()), "net": float(net.sum())},
+        }
+
+    @staticmethod
+    def _summarize(labels, sums):
+        return {label: {"count": int(sums[0, i]), "gross": float(sums[1, i]),
+                        "tax": float(sums[2, i]), "net": float(sums[3, i])}
+                for i, label in enumerate(labels)}
+
+
+def _payroll_chunk(args):
+    salaries, country_codes, department_codes, rates, n_departments = args
+    tax = salaries * rates.take(country_codes)
+    net = salaries - tax
+
+    def group(codes, length):
+        # rows: count, gross, tax, net per group code
+        return np.stack([np.bincount(codes, minlength=length).astype(np.float64)] +
+                        [np.bincount(codes, weights=column, minlength=length) for column in (salaries, tax, net)])
+
+    return tax, net, group(department_codes, n_departments), group(country_codes, len(rates))
+
+
 # Test Case 1: Class setup and basic functionality
 Employee.company_name = "GlobalTech Solutions"
 Employee.tax_rates = {"USA": 0.22, "India": 0.18, "UK": 0.25}
@@ -133,4 +492,119 @@ net_salary = emp1.calculate_net_salary()
 expected_net = 85000 - (85000 * 0.22)
 assert abs(net_salary - expected_net) < 0.01
 
+# Test Case 6: Streaming bulk hiring with batched validation
+import io
+
+hr_file = io.StringIO(
+    "name,department,base_salary,country,email\n"
+    "Ana Lima,Engineering,90000,USA,ana.lima@globaltech.com\n"
+    "Raj Patel,Sales,60000,India,raj.patel-at-globaltech\n"
+    "\"Kim, Lee\",Marketing,72000,UK,kim.lee@globaltech.com\n"
+    "Tom Ford,Legal,80000,USA,tom.ford@globaltech.com\n"
+    "Eva Green,HR,abc,UK,eva.green@globaltech.com\n"
+)
+first_id = Employee.id_allocator.next_number
+results = list(Employee.hire_from_csv(hr_file, batch_size=2, skip_header=True))
+assert [r.line for r in results] == [2, 3, 4, 5, 6]
+hired = [r.employee for r in results if r.employee]
+assert [e.name for e in hired] == ["Ana Lima", "Kim, Lee"]
+assert "email" in results[1].error and "department" in results[3].error and "salary" in results[4].error
+assert hired[1].employee_id.endswith(f"-{first_id + 1:04d}") and Employee.id_allocator.next_number == first_id + 2
+assert Employee.total_employees == 6
+assert Employee.departments["Engineering"] == 2 and Employee.departments["Marketing"] == 2
+
+class Contractor(Employee):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.agency = "Staffing Co"
+
+contractor = Contractor.hire_bulk_employees(["Ola Berg,Sales,50000,UK,ola.berg@globaltech.com"])[0].employee
+assert isinstance(contractor, Contractor) and contractor.agency == "Staffing Co"  # subclass __init__ runs
+assert contractor.employee_id.endswith(f"-{first_id + 2:04d}") and Employee.total_employees == 7
+
+# Test Case 7: Indexed registry with compound queries and incremental stats
+registry = EmployeeRegistry([emp1, emp2] + hired)
+lisa = Employee("Lisa Chen", "Sales", 70000, "India", "lisa.chen@globaltech.com")
+registry.add(lisa)
+assert len(registry) == 5 and registry.get(lisa.employee_id) is lisa
+
+lisa.add_performance_rating(4.0)
+lisa.add_performance_rating(3.8)
+assert abs(registry.get_average_performance(lisa.employee_id) - 3.9) < 1e-9
+assert registry.find(department="Sales", country="India", bonus_eligible=True) == []  # hired today
+lisa.hire_date = datetime.now() - timedelta(days=365.5)  # a year of service, but not 366 whole days
+assert not lisa.is_eligible_for_bonus() and registry.find(country="India", bonus_eligible=True) == []
+assert lisa in registry.find(country="India", bonus_eligible=False)
+lisa.hire_date = datetime.now() - timedelta(days=400)
+assert registry.find(department="Sales", country="India", bonus_eligible=True) == [lisa]
+assert registry.find(bonus_eligible=True) == [emp1, lisa]
+assert registry.find(country="UK") == [emp2, hired[1]]
+assert [e for e in registry.find() if e.is_eligible_for_bonus()] == registry.find(bonus_eligible=True)
+
+dept_stats = registry.get_department_stats()
+assert dept_stats["Sales"]["count"] == 2 and dept_stats["Sales"]["salary_total"] == 145000
+assert abs(dept_stats["Engineering"]["average_rating"] - 4.1667) < 0.001
+registry.update(lisa, department="Marketing", base_salary=80000)
+dept_stats = registry.get_department_stats()
+assert dept_stats["Sales"]["salary_total"] == 75000 and dept_stats["Sales"]["average_rating"] == 0
+assert dept_stats["Marketing"]["count"] == 2 and abs(dept_stats["Marketing"]["average_rating"] - 3.9) < 1e-9
+assert registry.find(department="Sales", bonus_eligible=True) == []
+registry.remove(lisa.employee_id)
+lisa.add_performance_rating(1)  # no longer tracked
+assert registry.get_department_stats()["Marketing"]["count"] == 1 and lisa.employee_id not in registry
+
+# Test Case 8: Vectorized payroll reproduces calculate_net_salary
+staff = [emp1, emp2, lisa] + hired + [Employee(f"Worker {i}", "Engineering", 50000 + 1234.56 * i, c, f"w{i}@globaltech.com")
+                                      for i, c in enumerate(["USA", "India", "UK", "Brazil"] * 3)]
+payroll = Payroll(staff)
+Employee.set_tax_rate("UK", 0.26)
+run = payroll.run()
+assert run["net"].tolist() == [emp.calculate_net_salary() for emp in staff]
+assert run["tax"].tolist() == [Employee.calculate_tax(emp.base_salary, emp.country) for emp in staff]
+assert run["by_country"]["Brazil"]["tax"] == 0 and run["by_country"]["Brazil"]["count"] == 3
+assert run["by_department"]["Engineering"]["count"] == 14
+assert abs(run["totals"]["net"] - sum(emp.calculate_net_salary() for emp in staff)) < 1e-6
+split = payroll.run(chunk_size=5)
+assert split["net"].tolist() == run["net"].tolist() and split["by_country"].keys() == run["by_country"].keys()
+assert all(abs(split["by_department"][d]["net"] - run["by_department"][d]["net"]) < 1e-6 for d in run["by_department"])
+if __name__ == "__main__":  # never start worker processes while the module is being imported
+    assert payroll.run(workers=2, chunk_size=5)["net"].tolist() == run["net"].tolist()
+Employee.set_tax_rate("UK", 0.25)
+
+# Test Case 9: Id allocation is collision-free across threads and processes
+allocator = IdAllocator()
+seen = [[] for _ in range(8)]
+workers = [threading.Thread(target=lambda out: out.extend(allocator.allocate()[1] for _ in range(500)), args=(out,))
+           for out in seen]
+for worker in workers:
+    worker.start()
+for worker in workers:
+    worker.join()
+assert sorted(n for out in seen for n in out) == list(range(1, 4001))
+
+import tempfile
+
+def _allocate_ids(args):
+    path, count = args
+    shared = IdAllocator(path, block_size=64)
+    first = shared.reserve(10)
+    return [shared.allocate()[1] for _ in range(count)] + list(range(first, first + 10))
+
+with tempfile.TemporaryDirectory() as id_dir:
+    counter_path = os.path.join(id_dir, "employee_ids")
+    if __name__ == "__main__":  # never start worker processes while the module is being imported
+        with ProcessPoolExecutor(4) as pool:
+            numbers = [n for part in pool.map(_allocate_ids, [(counter_path, 300)] * 8) for n in part]
+        assert len(numbers) == len(set(numbers)) == 8 * 310
+    else:
+        numbers = _allocate_ids((counter_path, 300)) + _allocate_ids((counter_path, 300))
+        assert len(numbers) == len(set(numbers)) == 2 * 310
+    shared = IdAllocator(counter_path, block_size=64)
+    previous_allocator = Employee.id_allocator
+    Employee.id_allocator = shared
+    recruit = Employee("New Hire", "HR", 60000, "UK", "new.hire@globaltech.com")
+    assert int(recruit.employee_id.rsplit("-", 1)[1]) == shared.block[0] - 1
+    assert recruit.employee_id.startswith(f"EMP-{datetime.now().year}-")
+    Employee.id_allocator = previous_allocator
+
 print("✅ All tests passed!")
\ No newline at end of file
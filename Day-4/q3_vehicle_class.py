@@ -1,4 +1,12 @@
+from bisect import bisect_left, bisect_right, insort
+from collections import namedtuple
 from datetime import datetime, timedelta
+from heapq import merge
+from itertools import islice
+from operator import itemgetter
+import threading
+
+import numpy as np
 
 # -------- Maintenance Record --------
 class MaintenanceRecord:
@@ -137,6 +145,293 @@ class Truck(Vehicle):
         }
 
 
+# -------- Fleet --------
+class Fleet:
+    # Available vehicles are bucketed by (type, fuel type, *facets) and each
+    # bucket is a list of (daily_rate, vehicle_id) kept sorted, so a search
+    # bisects the rate range in every matching bucket and merges the slices:
+    # O(b log n + k) for b buckets, and b stays small. Rent and return through
+    # the fleet so the buckets follow each vehicle's availability.
+    VEHICLE_TYPES = (Car, Motorcycle, Truck)
+    FACETS = {"Car": ("transmission_type", "has_gps"), "Motorcycle": ("bike_type",), "Truck": ("license_required",)}
+
+    def __init__(self, vehicles=()):
+        self.vehicles = {}   # vehicle_id -> vehicle
+        self.by_type = {}    # type name -> set of vehicle ids
+        self.available = {}  # bucket key -> sorted [(daily_rate, vehicle_id)] of available vehicles
+        self.lock = threading.RLock()
+        for vehicle in vehicles:
+            self.add(vehicle)
+
+    def __len__(self):
+        return len(self.vehicles)
+
+    def vehicle_type(self, vehicle):
+        return next((t.__name__ for t in self.VEHICLE_TYPES if isinstance(vehicle, t)), "Vehicle")
+
+    def bucket_key(self, vehicle):
+        kind = self.vehicle_type(vehicle)
+        return (kind, vehicle.fuel_type) + tuple(getattr(vehicle, facet) for facet in self.FACETS.get(kind, ()))
+
+    def add(self, vehicle):
+        with self.lock:
+            if vehicle.vehicle_id in self.vehicles:
+                raise ValueError(f"Vehicle {vehicle.vehicle_id} is already in the fleet")
+            self.vehicles[vehicle.vehicle_id] = vehicle
+            self.by_type.setdefault(self.vehicle_type(vehicle), set()).add(vehicle.vehicle_id)
+            if vehicle.is_available:
+                self._list(vehicle)
+
+    def remove(self, vehicle_id):
+        with self.lock:
+            vehicle = self.vehicles.pop(vehicle_id)
+            self.by_type[self.vehicle_type(vehicle)].discard(vehicle_id)
+            if vehicle.is_available:
+                self._unlist(vehicle)
+            return vehicle
+
+    def update(self, vehicle, **changes):
+        # Route changes to indexed attributes (daily_rate, fuel_type, facets) through here.
+        with self.lock:
+            if vehicle.is_available:
+                self._unlist(vehicle)
+            for attribute, value in changes.items():
+                setattr(vehicle, attribute, value)
+            if vehicle.is_available:
+                self._list(vehicle)
+
+    def _list(self, vehicle):
+        # insort shifts the tail with one memmove, cheap at fleet sizes
+        insort(self.available.setdefault(self.bucket_key(vehicle), []), (vehicle.daily_rate, vehicle.vehicle_id))
+
+    def _unlist(self, vehicle):
+        bucket = self.available[self.bucket_key(vehicle)]
+        entry = (vehicle.daily_rate, vehicle.vehicle_id)
+        i = bisect_left(bucket, entry)
+        if i < len(bucket) and bucket[i] == entry:
+            del bucket[i]
+
+    def rent(self, vehicle_id):
+        with self.lock:
+            vehicle = self.vehicles[vehicle_id]
+            was_available = vehicle.is_available
+            result = vehicle.rent()
+            if was_available and not vehicle.is_available:
+                self._unlist(vehicle)
+            return result
+
+    def return_vehicle(self, vehicle_id):
+        with self.lock:
+            vehicle = self.vehicles[vehicle_id]
+            was_available = vehicle.is_available
+            result = vehicle.return_vehicle()
+            if not was_available:
+                self._list(vehicle)
+            return result
+
+    def _matching_buckets(self, vehicle_type, fuel_type, facets):
+        # Yields (bucket, unindexed): facets missing from the bucket key, such as
+        # seating_capacity, come back to be checked per vehicle.
+        for key, bucket in self.available.items():
+            kind, fuel = key[0], key[1]
+            if vehicle_type is not None and kind != vehicle_type:
+                continue
+            if fuel_type is not None and fuel != fuel_type:
+                continue
+            names = self.FACETS.get(kind, ())
+            if all(key[2 + names.index(name)] == value for name, value in facets.items() if name in names):
+                yield bucket, {name: value for name, value in facets.items() if name not in names}
+
+    def _filtered(self, entries, facets):
+        for entry in entries:
+            vehicle = self.vehicles[entry[1]]
+            if all(getattr(vehicle, name, None) == value for name, value in facets.items()):
+                yield entry
+
+    def find_available(self, vehicle_type=None, fuel_type=None, min_rate=None, max_rate=None, limit=None, **facets):
+        # e.g. find_available("Car", max_rate=50, transmission_type="Automatic", has_gps=True)
+        # Returns vehicles cheapest first.
+        with self.lock:
+            slices = []
+            for bucket, unindexed in self._matching_buckets(vehicle_type, fuel_type, facets):
+                lo = 0 if min_rate is None else bisect_left(bucket, min_rate, key=itemgetter(0))
+                hi = len(bucket) if max_rate is None else bisect_right(bucket, max_rate, key=itemgetter(0))
+                if lo >= hi:
+                    continue
+                if unindexed:
+                    slices.append(self._filtered(bucket[lo:hi], unindexed))
+                else:
+                    slices.append(bucket[lo:hi if limit is None else min(hi, lo + limit)])
+            entries = slices[0] if len(slices) == 1 else merge(*slices)
+            return [self.vehicles[vehicle_id] for _, vehicle_id in islice(entries, limit)]
+
+    def count_available(self, vehicle_type=None, fuel_type=None, **facets):
+        with self.lock:
+            return sum(sum(1 for _ in self._filtered(bucket, unindexed)) if unindexed else len(bucket)
+                       for bucket, unindexed in self._matching_buckets(vehicle_type, fuel_type, facets))
+
+    def snapshot(self):
+        with self.lock:
+            return FleetColumns(self.vehicles.values(), self.vehicle_type)
+
+
+# -------- Reservations --------
+Reservation = namedtuple("Reservation", "reservation_id vehicle_id start end days cost")
+
+
+class ReservationBook:
+    # Each vehicle's bookings are half-open day ranges [start, end) kept as two
+    # parallel sorted lists of date ordinals. Bookings never overlap, so the ends
+    # are sorted too and a conflict check is a single bisect. Undated walk-in
+    # rentals (Fleet.rent) are not tracked here.
+    def __init__(self, fleet):
+        self.fleet = fleet
+        self.starts = {}        # vehicle_id -> sorted start ordinals
+        self.ends = {}          # vehicle_id -> end ordinals, same order as starts
+        self.reservations = {}  # reservation_id -> Reservation
+        self.next_reservation_id = 1
+        self.lock = fleet.lock
+
+    def __len__(self):
+        return len(self.reservations)
+
+    @staticmethod
+    def _span(start, end):
+        first, last = start.toordinal(), end.toordinal()
+        if last <= first:
+            raise ValueError("End date must be after start date")
+        return first, last
+
+    def _conflicts(self, vehicle_id, first, last):
+        starts = self.starts.get(vehicle_id)
+        if not starts:
+            return False
+        i = bisect_left(starts, last)  # bookings starting before the range ends
+        return i > 0 and self.ends[vehicle_id][i - 1] > first
+
+    def is_free(self, vehicle_id, start, end):
+        first, last = self._span(start, end)
+        with self.lock:
+            return self._conflicts(vehicle_id, first, last) is False
+
+    def quote(self, vehicle_id, start, end):
+        first, last = self._span(start, end)
+        return self.fleet.vehicles[vehicle_id].calculate_rental_cost(last - first)
+
+    def book(self, vehicle_id, start, end):
+        first, last = self._span(start, end)
+        with self.lock:
+            vehicle = self.fleet.vehicles[vehicle_id]
+            if self._conflicts(vehicle_id, first, last):
+                raise ValueError(f"Vehicle {vehicle_id} is already booked between {start} and {end}")
+            starts = self.starts.setdefault(vehicle_id, [])
+            i = bisect_left(starts, last)
+            starts.insert(i, first)
+            self.ends.setdefault(vehicle_id, []).insert(i, last)
+            reservation = Reservation(self.next_reservation_id, vehicle_id, start, end, last - first,
+                                      vehicle.calculate_rental_cost(last - first))
+            self.reservations[reservation.reservation_id] = reservation
+            self.next_reservation_id += 1
+            return reservation
+
+    def cancel(self, reservation_id):
+        with self.lock:
+            reservation = self.reservations.pop(reservation_id)
+            starts = self.starts[reservation.vehicle_id]
+            i = bisect_left(starts, reservation.start.toordinal())
+            del starts[i]
+            del self.ends[reservation.vehicle_id][i]
+            return reservation
+
+    def free_vehicles(self, start, end, vehicle_type=None, fuel_type=None, max_rate=None, **facets):
+        # Attribute filters run first, then vehicles with nothing booked skip the
+        # bisect entirely. Cheapest first.
+        first, last = self._span(start, end)
+        with self.lock:
+            vehicles = self.fleet.vehicles
+            ids = vehicles if vehicle_type is None else self.fleet.by_type.get(vehicle_type, ())
+            candidates = [vehicles[vehicle_id] for vehicle_id in ids]
+            if fuel_type is not None:
+                candidates = [v for v in candidates if v.fuel_type == fuel_type]
+            if max_rate is not None:
+                candidates = [v for v in candidates if v.daily_rate <= max_rate]
+            for name, value in facets.items():
+                candidates = [v for v in candidates if getattr(v, name, None) == value]
+            booked, conflicts = self.starts, self._conflicts
+            free = [v for v in candidates if v.vehicle_id not in booked or not conflicts(v.vehicle_id, first, last)]
+        free.sort(key=lambda v: (v.daily_rate, v.vehicle_id))
+        return free
+
+    def quotes(self, start, end, vehicle_type=None, **filters):
+        first, last = self._span(start, end)
+        return [(vehicle, vehicle.calculate_rental_cost(last - first))
+                for vehicle in self.free_vehicles(start, end, vehicle_type, **filters)]
+
+
+# -------- Fleet Columns --------
+class FleetColumns:
+    # Column snapshot of a fleet for quote pages and maintenance reports.
+    # Each vehicle's calculate_rental_cost is mapped to a pricing rule code;
+    # subclasses that override it with anything else are priced per object.
+    FLAT, SHORT_RENTAL_DISCOUNT, SURCHARGE, CUSTOM = range(4)
+    PRICING = {
+        Vehicle.calculate_rental_cost: FLAT,
+        Car.calculate_rental_cost: FLAT,
+        Motorcycle.calculate_rental_cost: SHORT_RENTAL_DISCOUNT,
+        Truck.calculate_rental_cost: SURCHARGE,
+    }
+
+    def __init__(self, vehicles, vehicle_type=lambda vehicle: type(vehicle).__name__):
+        vehicles = list(vehicles)
+        n = len(vehicles)
+        self.vehicles = vehicles
+        self.vehicle_ids = [v.vehicle_id for v in vehicles]
+        codes = {}
+        self.type_codes = np.fromiter((codes.setdefault(vehicle_type(v), len(codes)) for v in vehicles), np.int32, n)
+        self.vehicle_types = list(codes)
+        self.daily_rates = np.fromiter((v.daily_rate for v in vehicles), np.float64, n)
+        self.pricing = np.fromiter((self.PRICING.get(type(v).calculate_rental_cost, self.CUSTOM) for v in vehicles),
+                                   np.int8, n)
+        self.last_service = np.fromiter((v.last_service_date.timestamp() for v in vehicles), np.float64, n)
+        self.open_issues = np.fromiter((len(v.issues_reported) for v in vehicles), np.int64, n)
+
+    def __len__(self):
+        return len(self.vehicle_ids)
+
+    def rental_costs(self, days):
+        # Same operations in the same order as the subclass methods, so every
+        # cost equals calculate_rental_cost(days) exactly.
+        costs = self.daily_rates * days
+        if days <= 7:
+            discounted = self.pricing == self.SHORT_RENTAL_DISCOUNT
+            costs[discounted] *= 0.8
+        surcharged = self.pricing == self.SURCHARGE
+        costs[surcharged] += costs[surcharged] * 0.5
+        for i in np.flatnonzero(self.pricing == self.CUSTOM):
+            costs[i] = self.vehicles[i].calculate_rental_cost(days)
+        return costs
+
+    def maintenance(self, now=None, service_interval_days=90):
+        now = (now or datetime.now()).timestamp()
+        days_since_service = (now - self.last_service) / 86400
+        due = (days_since_service >= service_interval_days) | (self.open_issues > 0)
+        n_types = len(self.vehicle_types)
+        counts = np.bincount(self.type_codes, minlength=n_types)
+        days_totals = np.bincount(self.type_codes, days_since_service, n_types)
+        issue_totals = np.bincount(self.type_codes, self.open_issues, n_types)
+        due_totals = np.bincount(self.type_codes, due, n_types)
+        return {
+            "vehicle_ids": self.vehicle_ids,
+            "days_since_service": days_since_service,
+            "open_issues": self.open_issues,
+            "due_for_service": due,
+            "by_type": {kind: {"count": int(counts[i]), "open_issues": int(issue_totals[i]),
+                               "due_for_service": int(due_totals[i]),
+                               "average_days_since_service": float(days_totals[i] / counts[i])}
+                        for i, kind in enumerate(self.vehicle_types)},
+        }
+
+
 car = Car("CAR001", "Toyota", "Camry", 2023, 45.0, 5, 5, "Automatic", True)
 motorcycle = Motorcycle("BIKE001", "Harley", "Street 750", 2022, 35.0, 75, 750, "Cruiser")
 truck = Truck("TRUCK001", "Ford", "F-150", 2023, 85.0, 15000, 1200, "CDL-A", 5000)
@@ -193,4 +488,78 @@ assert isinstance(truck_efficiency, dict)
 assert "empty_mpg" in truck_efficiency
 assert "loaded_mpg" in truck_efficiency
 
+# Test Case 6: Fleet availability index
+fleet = Fleet([car, motorcycle, truck])
+fleet.add(Car("CAR002", "Honda", "Civic", 2022, 39.0, 12000, 5, "Automatic", True))
+fleet.add(Car("CAR003", "Ford", "Focus", 2021, 32.0, 30000, 5, "Manual", True))
+fleet.add(Car("CAR004", "Tesla", "Model 3", 2024, 95.0, 800, 5, "Automatic", True))
+fleet.add(Motorcycle("BIKE002", "Ducati", "Monster", 2023, 60.0, 2000, 937, "Sport"))
+
+cheap_gps = fleet.find_available("Car", max_rate=50, transmission_type="Automatic", has_gps=True)
+assert [v.vehicle_id for v in cheap_gps] == ["CAR002", "CAR001"]
+assert [v.vehicle_id for v in fleet.find_available(max_rate=40)] == ["CAR003", "BIKE001", "CAR002"]
+assert [v.vehicle_id for v in fleet.find_available(min_rate=60, limit=2)] == ["BIKE002", "TRUCK001"]
+assert fleet.find_available(fuel_type="Diesel") == [truck] and fleet.find_available("Truck", has_gps=True) == []
+assert [v.vehicle_id for v in fleet.find_available("Car", seating_capacity=5, limit=2)] == ["CAR003", "CAR002"]
+assert fleet.count_available("Car", seating_capacity=5) == 4 and fleet.find_available(seating_capacity=7) == []
+
+assert "rented successfully" in fleet.rent("CAR002").lower()
+assert fleet.rent("CAR002") == "Vehicle not available"
+assert [v.vehicle_id for v in fleet.find_available("Car", max_rate=50, has_gps=True)] == ["CAR003", "CAR001"]
+assert fleet.count_available("Car") == 3
+fleet.return_vehicle("CAR002")
+fleet.return_vehicle("CAR002")  # returning twice must not list it twice
+assert fleet.count_available("Car") == 4
+
+fleet.update(car, daily_rate=30.0)
+assert fleet.find_available("Car", limit=1) == [car]
+fleet.remove("CAR004")
+assert len(fleet) == 6 and fleet.count_available() == 6
+
+# Test Case 7: Dated reservations
+book = ReservationBook(fleet)
+day = datetime(2030, 6, 1)
+first = book.book("BIKE001", day, day + timedelta(days=5))
+assert first.days == 5 and first.cost == 35.0 * 5 * 0.8
+assert book.quote("TRUCK001", day, day + timedelta(days=2)) == 85.0 * 2 * 1.5
+book.book("BIKE001", day + timedelta(days=5), day + timedelta(days=7))  # back-to-back is fine
+book.book("BIKE001", day - timedelta(days=3), day)
+try:
+    book.book("BIKE001", day + timedelta(days=4), day + timedelta(days=6))
+    assert False, "Expected overlap rejection"
+except ValueError as e:
+    assert "already booked" in str(e)
+assert book.is_free("BIKE001", day + timedelta(days=7), day + timedelta(days=9))
+assert not book.is_free("BIKE001", day + timedelta(days=6), day + timedelta(days=8))
+assert [v.vehicle_id for v in book.free_vehicles(day, day + timedelta(days=3), "Motorcycle")] == ["BIKE002"]
+assert [(v.vehicle_id, cost) for v, cost in book.quotes(day, day + timedelta(days=2), "Car", has_gps=True)] == \
+    [("CAR001", 60.0), ("CAR003", 64.0), ("CAR002", 78.0)]
+book.cancel(first.reservation_id)
+assert book.is_free("BIKE001", day, day + timedelta(days=5)) and len(book) == 2
+
+# Test Case 8: Vectorized quotes and maintenance analytics
+class Limousine(Car):
+    def calculate_rental_cost(self, days):
+        return self.daily_rate * days + 200
+
+fleet.add(Limousine("LIMO001", "Lincoln", "Town Car", 2020, 150.0, 90000, 8, "Automatic", True))
+truck.report_issue("Brake pads worn")
+truck.report_issue("Tail light out")
+car.service()
+columns = fleet.snapshot()
+for days in (1, 3, 7, 8, 30):
+    costs = columns.rental_costs(days)
+    assert costs.tolist() == [v.calculate_rental_cost(days) for v in columns.vehicles]
+
+later = datetime.now() + timedelta(days=100)
+report = columns.maintenance(now=later)
+truck_row = columns.vehicle_ids.index("TRUCK001")
+assert report["open_issues"][truck_row] == 2
+assert all(99.9 < d <= 100.1 for d in report["days_since_service"])
+assert report["due_for_service"].all()
+assert columns.maintenance()["due_for_service"].sum() == 1  # only the truck has open issues
+assert report["by_type"]["Truck"] == {"count": 1, "open_issues": 2, "due_for_service": 1,
+                                      "average_days_since_service": report["days_since_service"][truck_row]}
+assert report["by_type"]["Car"]["count"] == 4 and report["by_type"]["Motorcycle"]["count"] == 2
+
 print("✅ All tests passed!")
\ No newline at end of file
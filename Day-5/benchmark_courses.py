@@ -0,0 +1,314 @@
+"""Benchmark the hot paths of the Day-5 course APIs.
+
+Synthesizes a university (students, professors, courses with skewed
+popularity), loads it into each implementation through its own endpoint
+functions and times enroll_student, update_grade, get_course_students,
+calculate_gpa and delete_professor. Results are written as JSON so runs of
+q2_course_crud, q2_course_crud with SQLite, and q3_course_advanced can be
+compared directly.
+
+    python benchmark_courses.py --scales small medium --output results.json
+    python benchmark_courses.py --profile cprofile --profile-dir profiles
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from fastapi import HTTPException
+
+HERE = Path(__file__).resolve().parent
+
+# ======= SYNTHETIC DATA =======
+SCALES = {
+    "small": {"students": 500, "professors": 25, "courses": 60, "courses_per_student": 4},
+    "medium": {"students": 5000, "professors": 150, "courses": 500, "courses_per_student": 4},
+    "large": {"students": 20000, "professors": 400, "courses": 2000, "courses_per_student": 5},
+}
+
+MAJORS = ["CS", "Math", "Physics", "Biology", "History", "Economics", "English", "Chemistry"]
+FIRST_NAMES = ["Alice", "Bob", "Carol", "Dave", "Erin", "Frank", "Grace", "Heidi", "Ivan", "Judy"]
+LAST_NAMES = ["Smith", "Lee", "Garcia", "Khan", "Nguyen", "Brown", "Rossi", "Sato", "Okafor", "Silva"]
+
+
+@dataclass
+class University:
+    professors: list
+    courses: list
+    students: list
+    enrollments: list
+    course_weights: list
+
+
+def generate_university(students, professors, courses, courses_per_student, seed=42):
+    rng = random.Random(seed)
+    start = date(2000, 1, 1)
+
+    professor_rows = [
+        {"id": pid, "name": f"Dr. {rng.choice(LAST_NAMES)}", "email": f"prof{pid}@uni.edu",
+         "department": rng.choice(MAJORS), "hire_date": start + timedelta(days=rng.randrange(8000))}
+        for pid in range(1, professors + 1)
+    ]
+    # Zipf-like popularity: a few intro courses draw most of the demand.
+    weights = [1 / (rank ** 1.1) for rank in range(1, courses + 1)]
+    rng.shuffle(weights)
+    course_rows = []
+    for cid in range(1, courses + 1):
+        demand = weights[cid - 1] / max(weights)
+        course_rows.append({
+            "id": cid, "name": f"Course {cid}", "code": f"C{cid:04d}", "credits": rng.choice([2, 3, 4]),
+            "professor_id": rng.randrange(1, professors + 1),
+            "max_capacity": max(15, int(500 * demand)),
+        })
+    student_rows = [
+        {"id": sid, "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+         "email": f"student{sid}@uni.edu", "major": rng.choice(MAJORS), "year": rng.randint(1, 4)}
+        for sid in range(1, students + 1)
+    ]
+    enrollment_rows = []
+    course_ids = [c["id"] for c in course_rows]
+    for sid in range(1, students + 1):
+        picked = set()
+        while len(picked) < min(courses_per_student, courses):
+            picked.add(rng.choices(course_ids, weights)[0])
+        for cid in picked:
+            enrollment_rows.append({"student_id": sid, "course_id": cid, "enrollment_date": date(2023, 1, 9)})
+    rng.shuffle(enrollment_rows)
+    return University(professor_rows, course_rows, student_rows, enrollment_rows, weights)
+
+
+# ======= IMPLEMENTATIONS =======
+def import_fresh(module_file, db_path=None):
+    # Both apps run their inline tests at import time; load a private copy so
+    # every scale starts from a clean module state and keep their output quiet.
+    if db_path:
+        os.environ["COURSE_DB_PATH"] = db_path
+    try:
+        spec = importlib.util.spec_from_file_location(f"bench_{module_file.stem}", module_file)
+        module = importlib.util.module_from_spec(spec)
+        with contextlib.redirect_stdout(io.StringIO()):
+            spec.loader.exec_module(module)
+    finally:
+        os.environ.pop("COURSE_DB_PATH", None)
+    return module
+
+
+class CourseCrudAdapter:
+    name = "q2_course_crud"
+
+    def __init__(self, db_path=None):
+        self.api = import_fresh(HERE / "q2_course_crud.py", db_path)
+        if db_path:
+            self.name = "q2_course_crud+sqlite"
+        # Drop the rows the inline tests left behind.
+        for pid in list(self.api.db_professors):
+            self.api.delete_professor(pid)
+        for sid in list(self.api.db_students):
+            self.api.delete_student(sid)
+
+    def load(self, uni):
+        for row in uni.professors:
+            self.api.create_professor(self.api.Professor(**row))
+        for row in uni.courses:
+            self.api.create_course(self.api.Course(**row))
+        for row in uni.students:
+            self.api.create_student(self.api.Student(**row))
+
+    def enroll_student(self, row):
+        self.api.enroll_student(self.api.Enrollment(**row))
+
+    def update_grade(self, student_id, course_id, grade):
+        self.api.update_grade(student_id, course_id, grade)
+
+    def get_course_students(self, course_id):
+        return self.api.get_course_students(course_id)
+
+    def calculate_gpa(self, student_id):
+        self.api.calculate_gpa(student_id)
+
+    def delete_professor(self, professor_id):
+        self.api.delete_professor(professor_id)
+
+
+class CourseAdvancedAdapter:
+    name = "q3_course_advanced"
+
+    def __init__(self):
+        self.api = import_fresh(HERE / "q3_course_advanced.py")
+        for table in (self.api.db_students, self.api.db_courses, self.api.db_professors, self.api.db_enrollments):
+            table.clear()
+
+    def load(self, uni):
+        for row in uni.professors:
+            self.api.create_professor(self.api.Professor(**row))
+        for row in uni.courses:
+            self.api.create_course(self.api.Course(**row))
+        for row in uni.students:
+            self.api.create_student(self.api.Student(**row))
+
+    def enroll_student(self, row):
+        self.api.enroll_student(self.api.Enrollment(**row))
+
+    def update_grade(self, student_id, course_id, grade):
+        self.api.update_grade(student_id, course_id, gpa=grade)
+
+    def get_course_students(self, course_id):
+        return self.api.get_course_students(course_id)
+
+    # q3 recomputes GPA inline in update_grade and has no calculate_gpa.
+    calculate_gpa = None
+
+    def delete_professor(self, professor_id):
+        self.api.delete_professor(professor_id)
+
+
+# ======= MEASUREMENT =======
+class Profiler:
+    def __init__(self, kind, directory):
+        self.kind = kind
+        self.directory = Path(directory) if directory else None
+        if kind == "pyinstrument":
+            try:
+                import pyinstrument  # noqa: F401
+            except ImportError:
+                sys.exit("pyinstrument is not installed: pip install pyinstrument")
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    @contextlib.contextmanager
+    def run(self, label):
+        if self.kind == "cprofile":
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                profiler.dump_stats(self.directory / f"{label}.prof")
+        elif self.kind == "pyinstrument":
+            from pyinstrument import Profiler as Pyinstrument
+            profiler = Pyinstrument()
+            profiler.start()
+            try:
+                yield
+            finally:
+                profiler.stop()
+                (self.directory / f"{label}.html").write_text(profiler.output_html())
+        else:
+            yield
+
+
+def time_calls(fn, args_list, profiler, label):
+    samples = []
+    failures = 0
+    with profiler.run(label):
+        for args in args_list:
+            start = time.perf_counter_ns()
+            try:
+                fn(*args)
+            except HTTPException:
+                failures += 1
+            samples.append(time.perf_counter_ns() - start)
+    total_s = sum(samples) / 1e9
+    samples.sort()
+    return {
+        "calls": len(samples),
+        "failures": failures,
+        "total_s": round(total_s, 6),
+        "mean_us": round(statistics.fmean(samples) / 1e3, 3) if samples else None,
+        "p50_us": round(samples[len(samples) // 2] / 1e3, 3) if samples else None,
+        "p95_us": round(samples[int(len(samples) * 0.95)] / 1e3, 3) if samples else None,
+        "ops_per_sec": round(len(samples) / total_s, 1) if total_s else None,
+    }
+
+
+def benchmark(adapter, uni, scale, sample_size, profiler, seed):
+    rng = random.Random(seed)
+    adapter.load(uni)
+    results = {}
+
+    def record(operation, fn, args_list):
+        if fn is None:
+            results[operation] = None
+            return
+        label = f"{adapter.name}-{scale}-{operation}".replace("+", "_")
+        results[operation] = time_calls(fn, args_list, profiler, label)
+
+    record("enroll_student", adapter.enroll_student, [(row,) for row in uni.enrollments])
+    graded = rng.sample(uni.enrollments, min(sample_size, len(uni.enrollments)))
+    record("update_grade", adapter.update_grade,
+           [(row["student_id"], row["course_id"], round(rng.uniform(2.0, 4.0), 1)) for row in graded])
+    course_ids = [c["id"] for c in uni.courses]
+    record("get_course_students", adapter.get_course_students,
+           [(cid,) for cid in rng.choices(course_ids, uni.course_weights, k=sample_size)])
+    record("calculate_gpa", adapter.calculate_gpa,
+           [(rng.randrange(1, len(uni.students) + 1),) for _ in range(sample_size)])
+    professor_ids = rng.sample([p["id"] for p in uni.professors], min(sample_size, len(uni.professors) // 2))
+    record("delete_professor", adapter.delete_professor, [(pid,) for pid in professor_ids])
+
+    return [
+        {"implementation": adapter.name, "scale": scale, "operation": operation, **(stats or {"skipped": True})}
+        for operation, stats in results.items()
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", nargs="+", default=["small", "medium"], choices=sorted(SCALES))
+    parser.add_argument("--implementations", nargs="+", default=["q2", "q2-sqlite", "q3"],
+                        choices=["q2", "q2-sqlite", "q3"])
+    parser.add_argument("--sample-size", type=int, default=1000,
+                        help="calls per read/update operation (enrollments always run in full)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--profile", choices=["cprofile", "pyinstrument"])
+    parser.add_argument("--profile-dir", default="profiles")
+    parser.add_argument("--output", default="-", help="JSON output file, '-' for stdout")
+    args = parser.parse_args(argv)
+
+    profiler = Profiler(args.profile, args.profile_dir if args.profile else None)
+    results = []
+    for scale in args.scales:
+        uni = generate_university(**SCALES[scale], seed=args.seed)
+        for impl in args.implementations:
+            with tempfile.TemporaryDirectory() as tmp:
+                if impl == "q2":
+                    adapter = CourseCrudAdapter()
+                elif impl == "q2-sqlite":
+                    adapter = CourseCrudAdapter(db_path=os.path.join(tmp, "bench.db"))
+                else:
+                    adapter = CourseAdvancedAdapter()
+                print(f"[{scale}] {adapter.name} ...", file=sys.stderr)
+                results.extend(benchmark(adapter, uni, scale, args.sample_size, profiler, args.seed))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "sample_size": args.sample_size,
+            "scales": {scale: SCALES[scale] for scale in args.scales},
+        },
+        "results": results,
+    }
+    payload = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(payload)
+    else:
+        Path(args.output).write_text(payload + "\n")
+
+
+if __name__ == "__main__":
+    main()
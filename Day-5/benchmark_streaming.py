@@ -0,0 +1,323 @@
+"""Benchmarks for the Day-5 media streaming platform.
+
+    python benchmark_streaming.py catalog --rows 1000000
+    python benchmark_streaming.py sessions --sessions 10000
+    python benchmark_streaming.py media --size-mb 512
+    python benchmark_streaming.py trending --events 2000000
+"""
+import argparse
+import asyncio
+import contextlib
+import importlib.util
+import io
+import json
+import math
+import random
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+HERE = Path(__file__).resolve().parent
+
+
+def load_streaming():
+    # q1_media_streaming runs its inline tests at import time; keep them quiet.
+    spec = importlib.util.spec_from_file_location("q1_media_streaming", HERE / "q1_media_streaming.py")
+    module = importlib.util.module_from_spec(spec)
+    # Registered first so worker processes can unpickle its module-level functions.
+    sys.modules[spec.name] = module
+    with contextlib.redirect_stdout(io.StringIO()):
+        spec.loader.exec_module(module)
+    return module
+
+
+def synthesize_catalog(ms, rows, seed=42):
+    rng = random.Random(seed)
+    factories = [
+        lambda i: ms.Movie(f"Movie {i}", "Drama", rng.randint(80, 180), "4K", "Director"),
+        lambda i: ms.TVShow(f"Show {i}", "Drama", rng.randint(1, 8), rng.randint(6, 90), 1),
+        lambda i: ms.Podcast(f"Podcast {i}", "Tech", rng.randint(15, 120), i, True),
+        lambda i: ms.Music(f"Song {i}", "Pop", rng.randint(90, 420), "Artist", "Album", False),
+    ]
+    return [rng.choice(factories)(i) for i in range(rows)]
+
+
+def bench_catalog(args):
+    ms = load_streaming()
+    contents = synthesize_catalog(ms, args.rows, args.seed)
+    plays = [random.Random(args.seed).randint(0, 1000) for _ in contents]
+
+    start = time.perf_counter()
+    per_object_costs = [c.calculate_streaming_cost() for c in contents]
+    per_object_sizes = [c.get_file_size() for c in contents]
+    per_object_total = sum(cost * n for cost, n in zip(per_object_costs, plays))
+    per_object_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    catalog = ms.ContentCatalog.from_contents(contents)
+    export_s = time.perf_counter() - start
+
+    play_counts = np.asarray(plays, dtype=np.float64)
+    start = time.perf_counter()
+    costs = catalog.streaming_costs()
+    sizes = catalog.file_sizes()
+    total = float(costs @ play_counts)
+    vectorized_s = time.perf_counter() - start
+
+    assert costs.tolist() == per_object_costs and sizes.tolist() == per_object_sizes
+    assert abs(total - per_object_total) <= 1e-6 * max(1.0, abs(per_object_total))
+    assert total == catalog.billing_total(plays)
+    return {
+        "benchmark": "catalog",
+        "rows": args.rows,
+        "per_object_rows_per_sec": round(args.rows / per_object_s),
+        "export_rows_per_sec": round(args.rows / export_s),
+        "vectorized_rows_per_sec": round(args.rows / vectorized_s),
+        "speedup": round(per_object_s / vectorized_s, 1),
+    }
+
+
+async def monitor_loop_lag(interval, samples, stop):
+    # How late the loop wakes a sleeping task: the scheduler latency every
+    # session sees between its own await points.
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        samples.append(loop.time() - start - interval)
+
+
+async def simulate_sessions(ms, args):
+    rng = random.Random(args.seed)
+    platform = ms.StreamingPlatform("Simulator")
+    catalog = [
+        ms.Movie("Feature", "Drama", 120, "4K", "Director"),
+        ms.Podcast("Daily", "News", 25, 1, True),
+        ms.Music("Single", "Pop", 210, "Artist", "Album", False),
+    ]
+    for content in catalog:
+        platform.add_content(content)
+    device_factories = [
+        lambda i: (ms.SmartTV(f"TV {i}", "55 inch", True), catalog[0]),
+        lambda i: (ms.Laptop(f"Laptop {i}", 16, i % 2 == 0), catalog[0]),
+        lambda i: (ms.Mobile(f"Phone {i}", "6 inch", i % 3 == 0), catalog[1]),
+        lambda i: (ms.SmartSpeaker(f"Speaker {i}", True, 10), catalog[2]),
+    ]
+    manager = ms.SessionManager(platform, max_sessions=args.max_active,
+                                segment_seconds=args.segment_seconds, time_scale=args.time_scale)
+
+    links = {}  # user -> (base Mbps, phase) of that user's simulated link
+
+    def bandwidth(session, index):
+        # Per-link sine wave plus noise: connections drift between good and poor.
+        base, phase = links[session.user]
+        return max(0.5, base * (1 + 0.6 * math.sin(index / 4 + phase)) + rng.gauss(0, 1))
+
+    jobs = []
+    for i in range(args.sessions):
+        user = ms.User(f"user{i}", "Premium")
+        device, content = rng.choice(device_factories)(i)
+        platform.register_user(user)
+        platform.register_device(device, user)
+        links[user] = (rng.uniform(3, 30), rng.uniform(0, 2 * math.pi))
+        jobs.append(manager.stream(user, content, device, bandwidth, args.segments))
+
+    lag, stop = [], asyncio.Event()
+    monitor = asyncio.create_task(monitor_loop_lag(args.lag_interval, lag, stop))
+    started = time.perf_counter()
+    results = await asyncio.gather(*jobs)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await monitor
+
+    lag_ms = sorted(sample * 1000 for sample in lag)
+    finished = [r for r in results if r["status"] == "finished"]
+    return {
+        "benchmark": "sessions",
+        "sessions": args.sessions,
+        "finished": len(finished),
+        "max_active": args.max_active,
+        "segments_per_session": args.segments,
+        "wall_seconds": round(elapsed, 3),
+        "segments_per_sec": round(sum(r["segments_played"] for r in finished) / elapsed),
+        "quality_changes": sum(r["quality_changes"] for r in finished),
+        "stalls": sum(r["stalls"] for r in finished),
+        "scheduler_latency_ms": {
+            "samples": len(lag_ms),
+            "p50": round(statistics.median(lag_ms), 3) if lag_ms else None,
+            "p95": round(lag_ms[int(len(lag_ms) * 0.95)], 3) if lag_ms else None,
+            "p99": round(lag_ms[int(len(lag_ms) * 0.99)], 3) if lag_ms else None,
+            "max": round(lag_ms[-1], 3) if lag_ms else None,
+        },
+    }
+
+
+def bench_sessions(args):
+    return asyncio.run(simulate_sessions(load_streaming(), args))
+
+
+class SocketSink:
+    # One end of a socketpair drained by a reader thread, as a client drains an
+    # edge server's socket: every byte sent is copied through the kernel and
+    # read back, unlike /dev/null, which accepts writes without touching them.
+    def __init__(self):
+        self.sender, receiver = socket.socketpair()
+        self.received = 0
+        self.reader = threading.Thread(target=self._drain, args=(receiver,), daemon=True)
+        self.reader.start()
+
+    def _drain(self, receiver):
+        buffer = bytearray(1 << 20)
+        with receiver:
+            while n := receiver.recv_into(buffer):
+                self.received += n
+
+    def send(self, chunk):
+        self.sender.sendall(chunk)
+        return len(chunk)
+
+    def close(self):
+        self.sender.close()
+        self.reader.join()
+        return self.received
+
+
+def bench_media(args):
+    ms = load_streaming()
+    size = args.size_mb << 20
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "segmented.bin")
+        with open(path, "wb") as f:
+            block = os.urandom(1 << 20)
+            for _ in range(args.size_mb):
+                f.write(block)
+
+        # Both paths send every chunk through the same socket; the mmap path
+        # never copies them into Python bytes first.
+        sink = SocketSink()
+        sent = 0
+        results = {"benchmark": "media", "size_mb": args.size_mb, "chunk_kb": args.chunk_kb, "sink": "socketpair"}
+        with ms.MediaFile(path, chunk_size=args.chunk_kb << 10) as media:
+            # One full unmeasured pass faults in every page, so both paths measure delivery, not disk.
+            sent += sum(sink.send(chunk) for chunk in media.iter_range())
+
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                delivered = sum(sink.send(chunk) for chunk in media.iter_range())
+                sent += delivered
+                elapsed = time.perf_counter() - start
+                results["full_file_gb_per_sec"] = max(results.get("full_file_gb_per_sec", 0),
+                                                      round(delivered / elapsed / 1e9, 2))
+
+            ranges = []
+            for _ in range(args.ranges):
+                first = rng.randrange(size)
+                ranges.append(f"bytes={first}-{min(size - 1, first + rng.randint(1, 8 << 20))}")
+            start = time.perf_counter()
+            delivered = 0
+            for header in ranges:
+                status, headers, body = media.serve(header)
+                delivered += sum(sink.send(chunk) for chunk in body)
+            elapsed = time.perf_counter() - start
+            sent += delivered
+            results["range_requests"] = args.ranges
+            results["range_gb_per_sec"] = round(delivered / elapsed / 1e9, 2)
+
+        # Baseline: the same bytes through buffered reads, which copy every chunk.
+        with open(path, "rb") as f:
+            start = time.perf_counter()
+            delivered = 0
+            while chunk := f.read(args.chunk_kb << 10):
+                delivered += sink.send(chunk)
+            elapsed = time.perf_counter() - start
+        sent += delivered
+        assert sink.close() == sent
+        results["read_copy_gb_per_sec"] = round(delivered / elapsed / 1e9, 2)
+    return results
+
+
+def bench_trending(args):
+    ms = load_streaming()
+    rng = random.Random(args.seed)
+    genres = [f"Genre {g}" for g in range(args.genres)]
+    contents = [ms.Movie(f"Title {i}", rng.choice(genres), 100, "1080p", "Director") for i in range(args.titles)]
+    # Zipf-like popularity over titles, events spread across one simulated hour.
+    weights = [1 / (rank ** 1.1) for rank in range(1, args.titles + 1)]
+    played = rng.choices(contents, weights, k=args.events)
+    stamps = sorted(rng.uniform(0, 3600) for _ in range(args.events))
+
+    tracker = ms.TrendingTracker(half_life=args.half_life, now=0)
+    record = tracker.record
+    start = time.perf_counter()
+    for content, at in zip(played, stamps):
+        record(content, at)
+    ingest_s = time.perf_counter() - start
+
+    reads = [rng.choice(genres) for _ in range(args.reads)]
+    start = time.perf_counter()
+    for genre in reads:
+        tracker.top(genre, args.k)
+    read_s = time.perf_counter() - start
+
+    expected = sorted((c for c in contents if c.genre == reads[-1]), key=lambda c: tracker.scores.get(c, 0.0),
+                      reverse=True)[:args.k]
+    assert [tracker.scores[c] for c in tracker.top(reads[-1], args.k)] == \
+           [tracker.scores[c] for c in expected if c in tracker.scores]
+    return {
+        "benchmark": "trending",
+        "titles": args.titles,
+        "events": args.events,
+        "events_per_minute": round(args.events / ingest_s * 60),
+        "read_us": round(read_s / args.reads * 1e6, 3),
+        "tracked_titles": len(tracker.scores),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=42)
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+
+    catalog = sub.add_parser("catalog", help="vectorized billing vs per-object cost/size methods")
+    catalog.add_argument("--rows", type=int, default=1_000_000)
+    catalog.set_defaults(run=bench_catalog)
+
+    sessions = sub.add_parser("sessions", help="simulate concurrent async streaming sessions")
+    sessions.add_argument("--sessions", type=int, default=10_000)
+    sessions.add_argument("--max-active", type=int, default=10_000, help="admission limit (backpressure)")
+    sessions.add_argument("--segments", type=int, default=20, help="segments streamed per session")
+    sessions.add_argument("--segment-seconds", type=float, default=2.0)
+    sessions.add_argument("--time-scale", type=float, default=0.01, help="simulated seconds -> wall seconds")
+    sessions.add_argument("--lag-interval", type=float, default=0.005, help="loop lag probe period in seconds")
+    sessions.set_defaults(run=bench_sessions)
+
+    media = sub.add_parser("media", help="zero-copy mmap chunk and range delivery throughput")
+    media.add_argument("--size-mb", type=int, default=512)
+    media.add_argument("--chunk-kb", type=int, default=1024)
+    media.add_argument("--ranges", type=int, default=2000, help="random HTTP Range requests to serve")
+    media.add_argument("--repeat", type=int, default=3)
+    media.set_defaults(run=bench_media)
+
+    trending = sub.add_parser("trending", help="decayed trending ingest rate and get_trending read latency")
+    trending.add_argument("--titles", type=int, default=100_000)
+    trending.add_argument("--genres", type=int, default=20)
+    trending.add_argument("--events", type=int, default=2_000_000)
+    trending.add_argument("--half-life", type=float, default=900.0, help="seconds")
+    trending.add_argument("--reads", type=int, default=100_000)
+    trending.add_argument("--k", type=int, default=10)
+    trending.set_defaults(run=bench_trending)
+
+    args = parser.parse_args(argv)
+    print(json.dumps(args.run(args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
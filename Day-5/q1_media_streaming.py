@@ -1,12 +1,39 @@
 from abc import ABC, abstractmethod
+from bisect import bisect_left, insort
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+import asyncio
+import heapq
+import math
+import mmap
+import multiprocessing
+import os
+import time
+import weakref
+
+import numpy as np
 
 # ===================== Abstract Base Classes =======================
 
+VIDEO_BITRATES = {"4K": 25.0, "1080p": 8.0, "720p": 5.0, "480p": 2.5}  # Mbps, best first
+AUDIO_BITRATE = 0.32  # Mbps
+
 class MediaContent(ABC):
+    is_audio = False
+    is_premium = False  # editorially premium regardless of rating
+    mime_type = "video/mp4"
+    keep_rating_histogram = True  # set False to keep only count and sum per title
+
     def __init__(self, title, genre):
         self.title = title
         self.genre = genre
-        self.ratings = []
+        # Running aggregates instead of a list of every rating ever given.
+        self.rating_count = 0
+        self.rating_sum = 0.0
+        self.rating_histogram = [0] * 5 if self.keep_rating_histogram else None  # 1-5 star buckets
+        self.rating_listeners = []  # callables notified after each accepted rating
+        self.media_path = None  # local file the edge serves for this title, if any
 
     @abstractmethod
     def play(self):
@@ -26,16 +53,34 @@ class MediaContent(ABC):
 
     def add_rating(self, rating):
         if 1 <= rating <= 5:
-            self.ratings.append(rating)
+            self.rating_count += 1
+            self.rating_sum += rating
+            if self.rating_histogram is not None:
+                self.rating_histogram[int(rating) - 1] += 1  # fractional ratings fall in the star below
+            for listener in self.rating_listeners:
+                listener(self)
 
     def get_average_rating(self):
-        if not self.ratings:
+        if not self.rating_count:
             return 0.0
-        return sum(self.ratings) / len(self.ratings)
+        return self.rating_sum / self.rating_count
+
+    def get_rating_distribution(self):
+        if self.rating_histogram is None:
+            return None
+        return {stars: count for stars, count in enumerate(self.rating_histogram, start=1)}
 
     def is_premium_content(self):
         return self.get_average_rating() > 4.0
 
+    def get_duration_minutes(self):
+        return self.get_duration()
+
+    def open_media(self, chunk_size=None):
+        if self.media_path is None:
+            raise ValueError(f"No media file attached to '{self.title}'")
+        return MediaFile(self.media_path, chunk_size or MediaFile.DEFAULT_CHUNK_SIZE, self.mime_type)
+
 class StreamingDevice(ABC):
     def __init__(self, name):
         self.name = name
@@ -49,7 +94,7 @@ class StreamingDevice(ABC):
         pass
 
     @abstractmethod
-    def adjust_quality(self):
+    def adjust_quality(self, bandwidth_mbps=None):
         pass
 
     def get_device_info(self):
@@ -58,6 +103,21 @@ class StreamingDevice(ABC):
     def check_compatibility(self, content: MediaContent):
         return True
 
+    def best_quality(self, bandwidth_mbps, ceiling):
+        # Highest rung at or below the device ceiling whose bitrate fits the bandwidth.
+        ladder = list(VIDEO_BITRATES)
+        for quality in ladder[ladder.index(ceiling):]:
+            if bandwidth_mbps is None or VIDEO_BITRATES[quality] <= bandwidth_mbps:
+                return quality
+        return ladder[-1]
+
+    def compatibility_profile(self):
+        # Key for cached compatibility results: two devices with equal profiles
+        # must give the same check_compatibility answer for any content.
+        # Subclasses whose check reads only a few attributes return their class
+        # and those attributes; None (the default) means never cache.
+        return None
+
 # ===================== Concrete Media Content =======================
 
 class Movie(MediaContent):
@@ -99,6 +159,9 @@ class TVShow(MediaContent):
         return self.total_episodes * 0.25  # 25 cents per episode
 
 class Podcast(MediaContent):
+    is_audio = True
+    mime_type = "audio/mpeg"
+
     def __init__(self, title, genre, duration, episode_number, transcript_available):
         super().__init__(title, genre)
         self.duration = duration  # in minutes
@@ -118,6 +181,9 @@ class Podcast(MediaContent):
         return 0.02 * self.duration
 
 class Music(MediaContent):
+    is_audio = True
+    mime_type = "audio/mpeg"
+
     def __init__(self, title, genre, duration, artist, album, lyrics_available):
         super().__init__(title, genre)
         self.duration = duration  # in seconds
@@ -137,6 +203,69 @@ class Music(MediaContent):
     def calculate_streaming_cost(self):
         return 0.01 * (self.duration / 60)  # 1 cent per minute
 
+    def get_duration_minutes(self):
+        return self.duration / 60
+
+# ===================== Columnar Catalog =======================
+
+class ContentCatalog:
+    # Column layout for bulk billing. Each type code maps to one concrete class;
+    # anything else (e.g. a subclass overriding a formula) gets code -1 and is
+    # priced through its own methods.
+    TYPE_CODES = {Movie: 0, TVShow: 1, Podcast: 2, Music: 3}
+
+    # Per-type rates indexed by type code. Each bulk formula is one multiply of
+    # rate and unit, the same operation the per-object method performs, so the
+    # results match it exactly (TVShow sizes use 45 * 3 = 135, exact for whole
+    # episode counts).
+    COST_RATES = np.array([0.05, 0.25, 0.02, 0.01])  # per minute, per episode, per minute, per minute
+    SIZE_RATES = np.array([5, 135, 2, 0.5])          # MB per minute, per episode, per minute, per second
+
+    def __init__(self, type_codes, durations, episodes, fallback=None):
+        self.type_codes = np.asarray(type_codes, dtype=np.int8)
+        self.durations = np.asarray(durations, dtype=np.float64)  # minutes, seconds for Music
+        self.episodes = np.asarray(episodes, dtype=np.float64)    # TVShow total_episodes, else 0
+        self.fallback = fallback or {}  # row -> content object with type code -1
+
+    @classmethod
+    def from_contents(cls, contents):
+        n = len(contents)
+        type_codes = np.empty(n, dtype=np.int8)
+        durations = np.zeros(n, dtype=np.float64)
+        episodes = np.zeros(n, dtype=np.float64)
+        fallback = {}
+        for row, content in enumerate(contents):
+            code = cls.TYPE_CODES.get(type(content), -1)
+            type_codes[row] = code
+            if code == 1:
+                episodes[row] = content.total_episodes
+            elif code == -1:
+                fallback[row] = content
+            else:
+                durations[row] = content.duration
+        return cls(type_codes, durations, episodes, fallback)
+
+    def __len__(self):
+        return len(self.type_codes)
+
+    def _apply_fallback(self, result, method):
+        for row, content in self.fallback.items():
+            result[row] = getattr(content, method)()
+        return result
+
+    def streaming_costs(self):
+        units = np.where(self.type_codes == 1, self.episodes, self.durations)
+        units = np.where(self.type_codes == 3, self.durations / 60, units)
+        return self._apply_fallback(self.COST_RATES.take(self.type_codes) * units, "calculate_streaming_cost")
+
+    def file_sizes(self):
+        units = np.where(self.type_codes == 1, self.episodes, self.durations)
+        return self._apply_fallback(self.SIZE_RATES.take(self.type_codes) * units, "get_file_size")
+
+    def billing_total(self, plays):
+        # plays: per-row play counts aligned with the catalog rows.
+        return float(np.dot(self.streaming_costs(), np.asarray(plays, dtype=np.float64)))
+
 # ===================== Concrete Devices =======================
 
 class SmartTV(StreamingDevice):
@@ -156,8 +285,8 @@ class SmartTV(StreamingDevice):
         print(message)
         return {"device": "Laptop", "content": content, "status": "streaming", "quality": "1080p"}
 
-    def adjust_quality(self):
-        print("Auto-adjusting quality for large screen and surround sound.")
+    def adjust_quality(self, bandwidth_mbps=None):
+        return self.best_quality(bandwidth_mbps, "4K")
 
     def get_device_info(self):
         return {
@@ -170,6 +299,8 @@ class SmartTV(StreamingDevice):
     def check_compatibility(self, content):
         return True
 
+    def compatibility_profile(self):
+        return (type(self),)
 
 class Laptop(StreamingDevice):
     def __init__(self, brand, ram_gb, has_gpu):
@@ -185,8 +316,8 @@ class Laptop(StreamingDevice):
         print(f"Streaming '{content.title}' on {self.brand} laptop.")
         return {"device": self.brand, "content": content.title, "status": "streaming", "quality": "1080p"}
 
-    def adjust_quality(self):
-        print("Adjusting quality based on RAM and GPU.")
+    def adjust_quality(self, bandwidth_mbps=None):
+        return self.best_quality(bandwidth_mbps, "4K" if self.has_gpu else "1080p")
 
     def get_device_info(self):
         return {
@@ -199,6 +330,9 @@ class Laptop(StreamingDevice):
     def check_compatibility(self, content):
         return self.ram_gb >= 4
 
+    def compatibility_profile(self):
+        return (type(self), self.ram_gb)
+
 
 class Mobile(StreamingDevice):
     def __init__(self, brand, screen_size, is_5g_enabled):
@@ -214,8 +348,8 @@ class Mobile(StreamingDevice):
         print(f"Streaming '{content.title}' on {self.brand} mobile.")
         return {"device": self.brand, "content": content.title, "status": "streaming", "quality": "720p"}
 
-    def adjust_quality(self):
-        print("Optimizing for mobile data and small screen.")
+    def adjust_quality(self, bandwidth_mbps=None):
+        return self.best_quality(bandwidth_mbps, "1080p" if self.is_5g_enabled else "720p")
 
     def get_device_info(self):
         return {
@@ -226,7 +360,10 @@ class Mobile(StreamingDevice):
         }
 
     def check_compatibility(self, content):
-        return content.duration <= 1800  # 30 minutes max
+        return content.get_duration() <= 1800  # 30 minutes max
+
+    def compatibility_profile(self):
+        return (type(self),)
 
 
 class SmartSpeaker(StreamingDevice):
@@ -240,11 +377,14 @@ class SmartSpeaker(StreamingDevice):
         return f"{self.name} speaker connected via Bluetooth."
 
     def stream_content(self, content):
+        if not self.check_compatibility(content):
+            return {"device": self.name, "content": content.title, "status": "error", "quality": "audio only",
+                    "message": f"{self.name} supports audio only"}
         print(f"Playing '{content.title}' on {self.name} speaker.")
-        return {"device": self.name, "content": content.title, "status": "streaming", "quality": "audio only"}
+        return {"device": self.name, "content": content.title, "status": "success", "quality": "audio only"}
 
-    def adjust_quality(self):
-        print("Adjusting audio quality based on volume level.")
+    def adjust_quality(self, bandwidth_mbps=None):
+        return "audio only"
 
     def get_device_info(self):
         return {
@@ -257,19 +397,328 @@ class SmartSpeaker(StreamingDevice):
     def check_compatibility(self, content):
         return hasattr(content, "is_audio") and content.is_audio
 
+    def compatibility_profile(self):
+        return (type(self),)
+
+# ===================== Media Delivery =======================
+
+class RangeNotSatisfiable(ValueError):
+    pass
+
+
+class MediaFile:
+    # Serves a local media file as memoryview slices over a read-only mmap, so
+    # chunks and byte ranges reach the caller without being copied. Slices
+    # must be released (or garbage collected) before close().
+    DEFAULT_CHUNK_SIZE = 1 << 20  # 1 MiB segments
+
+    def __init__(self, path, chunk_size=DEFAULT_CHUNK_SIZE, mime_type="application/octet-stream"):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.mime_type = mime_type
+        with open(path, "rb") as f:
+            self.size = os.fstat(f.fileno()).st_size
+            # mmap cannot map an empty file; the mapping outlives the descriptor.
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        self._view = memoryview(self._map) if self._map is not None else memoryview(b"")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        # Returns False while response slices still pin the mapping; call again
+        # once they are released.
+        self._view.release()
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                return False
+        return True
+
+    def segment_count(self):
+        return -(-self.size // self.chunk_size)
+
+    def segment(self, index):
+        if not 0 <= index < self.segment_count():
+            raise IndexError(f"segment {index} out of range")
+        start = index * self.chunk_size
+        return self._view[start:start + self.chunk_size]
+
+    def iter_range(self, start=0, end=None):
+        # Yields chunk_size slices covering bytes start..end inclusive.
+        end = self.size - 1 if end is None else min(end, self.size - 1)
+        position = start
+        while position <= end:
+            stop = min(position + self.chunk_size, end + 1)
+            yield self._view[position:stop]
+            position = stop
+
+    def parse_range(self, header):
+        # Single "bytes=" ranges only; returns None when the full body should be sent.
+        if not header:
+            return None
+        unit, _, spec = header.partition("=")
+        if unit.strip().lower() != "bytes" or "," in spec:
+            return None
+        first, _, last = spec.strip().partition("-")
+        try:
+            if not first:
+                suffix = int(last)
+                if suffix <= 0:
+                    raise RangeNotSatisfiable(header)
+                return max(0, self.size - suffix), self.size - 1
+            start = int(first)
+            end = int(last) if last else self.size - 1
+        except ValueError:
+            return None
+        if start >= self.size or end < start:
+            raise RangeNotSatisfiable(header)
+        return start, min(end, self.size - 1)
+
+    def serve(self, range_header=None):
+        # Returns (status, headers, body chunks) in the shape of an HTTP response.
+        headers = {"Accept-Ranges": "bytes", "Content-Type": self.mime_type}
+        try:
+            byte_range = self.parse_range(range_header)
+        except RangeNotSatisfiable:
+            headers["Content-Range"] = f"bytes */{self.size}"
+            return 416, headers, iter(())
+        if byte_range is None:
+            headers["Content-Length"] = str(self.size)
+            return 200, headers, self.iter_range()
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{self.size}"
+        headers["Content-Length"] = str(end - start + 1)
+        return 206, headers, self.iter_range(start, end)
+
+# ===================== Async Sessions =======================
+
+class StreamingSession:
+    def __init__(self, user, content, device, buffer_segments):
+        self.user = user
+        self.content = content
+        self.device = device
+        self.buffer = asyncio.Queue(maxsize=buffer_segments)  # full buffer pauses the download
+        self.status = "queued"
+        self.quality = None
+        self.quality_changes = 0
+        self.segments_played = 0
+        self.stalls = 0
+
+    def summary(self):
+        return {
+            "status": self.status,
+            "user": self.user.name,
+            "content": self.content.title,
+            "quality": self.quality,
+            "quality_changes": self.quality_changes,
+            "segments_played": self.segments_played,
+            "stalls": self.stalls,
+        }
+
+
+class SessionManager:
+    # Runs many sessions on one event loop. Backpressure comes from two places:
+    # the admission semaphore caps concurrently streaming sessions (the rest
+    # wait in line), and each session's bounded buffer makes its downloader
+    # wait whenever playback falls behind.
+    def __init__(self, platform, max_sessions=10000, buffer_segments=3, segment_seconds=2.0, time_scale=1.0):
+        self.platform = platform
+        self.sessions = {}  # (user, device) -> StreamingSession
+        self.max_sessions = max_sessions
+        # asyncio primitives bind to the loop that first waits on them, and the
+        # manager outlives any single asyncio.run(), so each loop gets its own.
+        self._admission = weakref.WeakKeyDictionary()  # event loop -> Semaphore
+        self.buffer_segments = buffer_segments
+        self.segment_seconds = segment_seconds
+        self.time_scale = time_scale  # < 1 runs simulated time faster than real time
+
+    @property
+    def admission(self):
+        loop = asyncio.get_running_loop()
+        semaphore = self._admission.get(loop)
+        if semaphore is None:
+            semaphore = self._admission[loop] = asyncio.Semaphore(self.max_sessions)
+        return semaphore
+
+    def active_sessions(self, user=None):
+        return [s for (u, _), s in self.sessions.items() if user is None or u is user]
+
+    async def stream(self, user, content, device, bandwidth, segments=None):
+        # bandwidth(session, segment_index) -> Mbps, e.g. a simulated network signal.
+        key = (user, device)
+        if key in self.sessions:
+            return {"status": "error", "message": "Device is already streaming"}
+        error = self.platform.access_error(user, content, device)
+        if error:
+            return {"status": "error", "message": error}
+        if segments is None:
+            segments = max(1, int(content.get_duration_minutes() * 60 / self.segment_seconds))
+
+        session = StreamingSession(user, content, device, self.buffer_segments)
+        self.sessions[key] = session
+        try:
+            async with self.admission:
+                session.status = "streaming"
+                await asyncio.gather(self._download(session, bandwidth, segments), self._play(session, segments))
+            session.status = "finished"
+        finally:
+            del self.sessions[key]
+        return session.summary()
+
+    async def _download(self, session, bandwidth, segments):
+        for index in range(segments):
+            mbps = bandwidth(session, index)
+            quality = session.device.adjust_quality(mbps)
+            if quality != session.quality:
+                session.quality_changes += session.quality is not None
+                session.quality = quality
+            bitrate = VIDEO_BITRATES.get(quality, AUDIO_BITRATE)
+            await asyncio.sleep(self.segment_seconds * bitrate / max(mbps, 0.01) * self.time_scale)
+            await session.buffer.put(quality)
+
+    async def _play(self, session, segments):
+        for _ in range(segments):
+            if session.buffer.empty() and session.segments_played:
+                session.stalls += 1  # rebuffering mid-stream; the initial fill is not a stall
+            await session.buffer.get()
+            await asyncio.sleep(self.segment_seconds * self.time_scale)
+            session.segments_played += 1
+
+# ===================== Trending =======================
+
+class TrendingTracker:
+    # Forward-decayed play counters: each play adds exp((t - landmark) / tau)
+    # instead of decaying every title on every tick. All titles share the same
+    # implicit decay factor, so orderings only change when a title is played and
+    # a bounded leaderboard per genre stays exact with O(1) work per event.
+    MAX_EXPONENT = 600.0  # renormalize before exp() gets near float overflow
+
+    def __init__(self, half_life=3600.0, window_seconds=3600, bucket_seconds=60, board_size=100, now=None):
+        self.tau = half_life / math.log(2)
+        self.landmark = time.time() if now is None else now
+        self.window_buckets = -(-window_seconds // bucket_seconds)
+        self.bucket_seconds = bucket_seconds
+        self.board_size = board_size
+        self.scores = {}   # content -> decayed plays, scaled to the landmark
+        self.windows = {}  # content -> ([bucket epoch], [plays]) ring, constant size per title
+        self.boards = {}   # genre (None = all genres) -> contents sorted by score, best first
+        self.on_board = {}  # genre -> set of contents currently on that board
+
+    def record(self, content, at=None, weight=1.0):
+        at = time.time() if at is None else at
+        exponent = (at - self.landmark) / self.tau
+        if exponent > self.MAX_EXPONENT:
+            self._renormalize(at)
+            exponent = 0.0
+        score = self.scores[content] = self.scores.get(content, 0.0) + weight * math.exp(exponent)
+
+        epoch = int(at // self.bucket_seconds)
+        ring = self.windows.get(content)
+        if ring is None:
+            ring = self.windows[content] = ([-1] * self.window_buckets, [0] * self.window_buckets)
+        slot = epoch % self.window_buckets
+        if ring[0][slot] != epoch:
+            ring[0][slot], ring[1][slot] = epoch, 0
+        ring[1][slot] += 1
+
+        self._promote(content.genre, content, score)
+        self._promote(None, content, score)
+
+    def _promote(self, genre, content, score):
+        board = self.boards.setdefault(genre, [])
+        members = self.on_board.setdefault(genre, set())
+        if content in members:
+            i = board.index(content)
+        elif len(board) < self.board_size or score > self.scores[board[-1]]:
+            board.append(content)
+            members.add(content)
+            i = len(board) - 1
+        else:
+            return
+        # Scores only grow, so the title can only move up.
+        while i and self.scores[board[i - 1]] < score:
+            board[i - 1], board[i] = board[i], board[i - 1]
+            i -= 1
+        if len(board) > self.board_size:
+            members.discard(board.pop())
+
+    def _renormalize(self, at):
+        factor = math.exp((self.landmark - at) / self.tau)
+        for content in self.scores:
+            self.scores[content] *= factor
+        self.landmark = at
+
+    def score(self, content, at=None):
+        at = time.time() if at is None else at
+        return float(self.scores.get(content, 0.0) * math.exp((self.landmark - at) / self.tau))
+
+    def window_plays(self, content, at=None):
+        ring = self.windows.get(content)
+        if ring is None:
+            return 0
+        oldest = int((time.time() if at is None else at) // self.bucket_seconds) - self.window_buckets
+        return sum(plays for epoch, plays in zip(*ring) if epoch > oldest)
+
+    def top(self, genre=None, k=10):
+        if k <= self.board_size:
+            return self.boards.get(genre, [])[:k]
+        candidates = self.scores if genre is None else (c for c in self.scores if c.genre == genre)
+        return heapq.nlargest(k, candidates, key=self.scores.get)
+
 # ===================== User & Platform =======================
 
+COMPAT_UNKNOWN, COMPAT_NO, COMPAT_YES = 0, 1, 2
+
+# Content classes each subscription tier may play; unknown tiers get the Free set.
+TIER_ENTITLEMENTS = {
+    "Free": frozenset({"standard"}),
+    "Basic": frozenset({"standard"}),
+    "Premium": frozenset({"standard", "premium"}),
+}
+
 class User:
-    def __init__(self, name, subscription_tier="Free"):
+    HISTORY_LIMIT = 100  # most recent titles/sessions kept per user
+
+    def __init__(self, name, subscription_tier="Free", preferences=None):
         self.name = name
         self.subscription_tier = subscription_tier
-        self.watch_history = []
-        self.preferences = []
-
-    def watch(self, content: MediaContent):
+        # Ring buffers: old entries fall off so per-user memory stays bounded.
+        self.watch_history = deque(maxlen=self.HISTORY_LIMIT)
+        self.sessions = deque(maxlen=self.HISTORY_LIMIT)  # (title, genre, device, started_at, minutes)
+        self.preferences = list(preferences or [])
+        self.preference_set = set(self.preferences)
+        # Rolling aggregates over everything ever watched, not just the buffer.
+        self.genre_counts = {}  # genre -> number of titles watched
+        self.total_watch_time = 0.0  # minutes
+        self.titles_watched = 0
+
+    def watch(self, content: MediaContent, device=None, started_at=None, duration=None):
+        minutes = content.get_duration_minutes() if duration is None else duration
+        started_at = time.time() if started_at is None else started_at
         self.watch_history.append(content.title)
-        if content.genre not in self.preferences:
+        self.sessions.append((content.title, content.genre, device, started_at, minutes))
+        self.genre_counts[content.genre] = self.genre_counts.get(content.genre, 0) + 1
+        self.total_watch_time += minutes
+        self.titles_watched += 1
+        if content.genre not in self.preference_set:
+            self.preference_set.add(content.genre)
             self.preferences.append(content.genre)
+        return started_at, minutes
+
+    def get_analytics(self, top_genres=3):
+        favorites = heapq.nlargest(top_genres, self.genre_counts.items(), key=itemgetter(1))
+        return {
+            "user": self.name,
+            "total_watch_time": round(self.total_watch_time, 2),
+            "titles_watched": self.titles_watched,
+            "favorite_genres": [genre for genre, _ in favorites],
+            "recent_sessions": len(self.sessions),
+        }
 
     def get_watch_history(self):
         return self.watch_history
@@ -281,29 +730,279 @@ class User:
         self.subscription_tier = tier
 
 class StreamingPlatform:
+    RATING_WEIGHT = 0.7   # share of the score from the title's average rating
+    HISTORY_WEIGHT = 0.3  # share from how much of the user's viewing is in that genre
+
     def __init__(self, name):
         self.name = name
         self.users = []
         self.content_library = []
+        self.genre_index = {}     # genre -> list of content in that genre
+        # Kept sorted as ratings arrive: (-average rating, library position), best first.
+        self.genre_rankings = {}  # genre -> sorted ranking keys
+        self.ranking_keys = {}    # content -> (genre, its current key in genre_rankings)
+        # Snapshot written by precompute_recommendations, e.g. from a nightly job.
+        # A user's entry is dropped when they watch something or when a genre it
+        # was built from gets a new title or rating.
+        self.recommendation_cache = {}  # user -> top-k content list
+        self.recommendation_cache_k = 0
+        self.cached_users_by_genre = {}  # genre (None = all genres) -> users whose cached entry reads it
+        self.user_devices = {}  # user -> registered devices
+        self.content_positions = {}  # content -> index in content_library
+        self.compatibility = {}      # device profile -> bytearray of COMPAT_* states per library position
+        # Same layout keyed by tier; an upgrade simply reads another tier's array.
+        self.entitlements = {}       # subscription tier -> bytearray of COMPAT_* states per library position
+        self.session_manager = SessionManager(self)
+        self.trending = TrendingTracker()
+        self.media_files = {}  # content -> open MediaFile
+        self.retired_media = []  # replaced MediaFiles still pinned by open responses
 
     def register_user(self, user: User):
         self.users.append(user)
 
+    def register_device(self, device: StreamingDevice, user: User):
+        devices = self.user_devices.setdefault(user, [])
+        if device not in devices:
+            devices.append(device)
+
     def add_content(self, content: MediaContent):
+        self.content_positions[content] = len(self.content_library)
         self.content_library.append(content)
+        self.genre_index.setdefault(content.genre, []).append(content)
+        self._rank(content)
+        self._invalidate_recommendations(content.genre)
+        content.rating_listeners.append(self._on_rating_changed)
+
+    def _on_rating_changed(self, content: MediaContent):
+        self._rank(content)
+        self._invalidate_recommendations(content.genre)
+        self._reset_states(self.entitlements, content)  # a rating can move a title across the premium threshold
+
+    def _invalidate_recommendations(self, genre):
+        for key in (genre, None):
+            for user in self.cached_users_by_genre.pop(key, ()):
+                self.recommendation_cache.pop(user, None)
+
+    def _rank(self, content: MediaContent):
+        # Moves one title within its genre's ranking: a bisect to drop the old key
+        # and an insort for the new one, so a rating costs O(log G) comparisons and
+        # a memmove instead of re-sorting the genre. Ties keep library order.
+        previous = self.ranking_keys.get(content)
+        if previous is not None:
+            genre, key = previous
+            ranking = self.genre_rankings[genre]
+            del ranking[bisect_left(ranking, key)]
+            if genre != content.genre:
+                self.genre_index[genre].remove(content)
+                self.genre_index.setdefault(content.genre, []).append(content)
+        key = (-content.get_average_rating(), self.content_positions[content])
+        insort(self.genre_rankings.setdefault(content.genre, []), key)
+        self.ranking_keys[content] = (content.genre, key)
+
+    def _ranked_genre(self, genre, k):
+        return [self.content_library[position] for _, position in self.genre_rankings.get(genre, [])[:k]]
+
+    def get_recommendations(self, user: User, k=5, use_cache=True):
+        if use_cache:
+            cached = self.recommendation_cache.get(user)
+            if cached is not None and k <= self.recommendation_cache_k:
+                return cached[:k]
+
+        genres = user.get_preferences() or list(self.genre_index)
+        total_watched = user.titles_watched
+
+        def score(content):
+            if total_watched:
+                affinity = user.genre_counts.get(content.genre, 0) / total_watched
+            else:
+                affinity = 1 / len(genres)
+            return self.RATING_WEIGHT * content.get_average_rating() / 5 + self.HISTORY_WEIGHT * affinity
+
+        # Within a genre the score only varies with rating, so the top k titles
+        # of each ranked genre are the only candidates that can make the cut.
+        candidates = []
+        for genre in set(genres):
+            candidates.extend(self._ranked_genre(genre, k))
+        return heapq.nlargest(k, candidates, key=score)
+
+    def precompute_recommendations(self, k=10, workers=None):
+        global _batch_state
+        workers = workers or os.cpu_count() or 1
+        chunk_size = max(1, -(-len(self.users) // (workers * 4)))
+        chunks = [(start, min(start + chunk_size, len(self.users)), k)
+                  for start in range(0, len(self.users), chunk_size)]
+        _batch_state = (self, {id(content): i for i, content in enumerate(self.content_library)})
+        try:
+            # Forked workers share the platform and its index copy-on-write, so
+            # only user ranges go out and content positions come back.
+            if workers > 1 and len(chunks) > 1 and "fork" in multiprocessing.get_all_start_methods():
+                with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("fork")) as pool:
+                    results = list(pool.map(_recommend_chunk, chunks))
+            else:
+                results = list(map(_recommend_chunk, chunks))
+        finally:
+            _batch_state = None
+
+        cache = {}
+        by_genre = {}
+        for (start, stop, _), rows in zip(chunks, results):
+            for user, positions in zip(self.users[start:stop], rows):
+                cache[user] = [self.content_library[i] for i in positions]
+                for genre in user.get_preferences() or (None,):
+                    by_genre.setdefault(genre, set()).add(user)
+        self.recommendation_cache = cache
+        self.recommendation_cache_k = k
+        self.cached_users_by_genre = by_genre
+        return len(cache)
 
     def recommend_content(self, user: User):
-        preferred_genres = user.get_preferences()
-        for content in self.content_library:
-            if content.genre in preferred_genres:
-                return content
+        recommendations = self.get_recommendations(user, 1)
+        return recommendations[0] if recommendations else None
+
+    def update_content(self, content: MediaContent, **changes):
+        old_genre = content.genre
+        for attribute, value in changes.items():
+            setattr(content, attribute, value)
+        if content in self.ranking_keys:
+            self._rank(content)  # follows a genre change
+            self._invalidate_recommendations(old_genre)
+            if content.genre != old_genre:
+                self._invalidate_recommendations(content.genre)
+        self.invalidate_content(content)
+
+    def invalidate_content(self, content: MediaContent):
+        self._reset_states(self.compatibility, content)
+        self._reset_states(self.entitlements, content)
+
+    def _reset_states(self, cache, content):
+        position = self.content_positions.get(content)
+        if position is not None:
+            for states in cache.values():
+                if position < len(states):
+                    states[position] = COMPAT_UNKNOWN
+
+    def _compatibility_states(self, device: StreamingDevice):
+        # Device attributes are part of the profile, so changing them selects a
+        # different (possibly empty) state array instead of reusing stale answers.
+        # Devices without a profile get a fresh, uncached array every time.
+        profile = device.compatibility_profile()
+        states = bytearray() if profile is None else self.compatibility.setdefault(profile, bytearray())
+        if len(states) < len(self.content_library):
+            states.extend(bytes(len(self.content_library) - len(states)))
+        return states
+
+    def is_compatible(self, device: StreamingDevice, content: MediaContent):
+        position = self.content_positions.get(content)
+        if position is None or device.compatibility_profile() is None:
+            return device.check_compatibility(content)
+        states = self._compatibility_states(device)
+        if states[position] == COMPAT_UNKNOWN:
+            states[position] = COMPAT_YES if device.check_compatibility(content) else COMPAT_NO
+        return states[position] == COMPAT_YES
+
+    def precompute_compatibility(self, device: StreamingDevice):
+        states = self._compatibility_states(device)
+        position = states.find(COMPAT_UNKNOWN)
+        while position != -1:
+            states[position] = COMPAT_YES if device.check_compatibility(self.content_library[position]) else COMPAT_NO
+            position = states.find(COMPAT_UNKNOWN, position + 1)
+        return states
+
+    def playable_titles(self, device: StreamingDevice):
+        states = np.frombuffer(self.precompute_compatibility(device), dtype=np.uint8)
+        return [self.content_library[i] for i in np.flatnonzero(states == COMPAT_YES)]
+
+    @staticmethod
+    def content_class(content: MediaContent):
+        return "premium" if content.is_premium or content.is_premium_content() else "standard"
+
+    def _check_entitlement(self, tier, content):
+        return self.content_class(content) in TIER_ENTITLEMENTS.get(tier, TIER_ENTITLEMENTS["Free"])
+
+    def is_entitled(self, user: User, content: MediaContent):
+        position = self.content_positions.get(content)
+        if position is None:
+            return self._check_entitlement(user.subscription_tier, content)
+        states = self.entitlements.setdefault(user.subscription_tier, bytearray())
+        if len(states) < len(self.content_library):
+            states.extend(bytes(len(self.content_library) - len(states)))
+        if states[position] == COMPAT_UNKNOWN:
+            states[position] = COMPAT_YES if self._check_entitlement(user.subscription_tier, content) else COMPAT_NO
+        return states[position] == COMPAT_YES
+
+    def access_error(self, user: User, content: MediaContent, device: StreamingDevice):
+        # Entitlement first: a Free user should hear about the plan, not the device.
+        if not self.is_entitled(user, content):
+            return f"'{content.title}' requires a higher subscription tier than {user.subscription_tier}"
+        if not self.is_compatible(device, content):
+            return "Content is not compatible with this device"
         return None
 
+    def start_watching(self, user: User, content: MediaContent, device: StreamingDevice, duration=None):
+        error = self.access_error(user, content, device)
+        if error:
+            return {"status": "error", "message": error}
+        device_name = getattr(device, "name", None) or getattr(device, "brand", type(device).__name__)
+        started_at, minutes = user.watch(content, device_name, duration=duration)
+        self.recommendation_cache.pop(user, None)  # genre affinities just moved
+        self.trending.record(content, started_at)
+        return {
+            "status": "started",
+            "user": user.name,
+            "content": content.title,
+            "device": device_name,
+            "started_at": started_at,
+            "duration": minutes,
+        }
+
+    def get_trending(self, genre=None, k=10):
+        return self.trending.top(genre, k)
+
+    def get_user_analytics(self, user: User):
+        return user.get_analytics()
+
+    def attach_media(self, content: MediaContent, path):
+        # The new file goes live first; the old mapping is closed once no open
+        # response still slices into it.
+        content.media_path = path
+        previous = self.media_files.pop(content, None)
+        if path is not None:
+            self.media_files[content] = content.open_media()
+        if previous is not None:
+            self.retired_media.append(previous)
+        self._close_retired_media()
+
+    def _close_retired_media(self):
+        self.retired_media = [media for media in self.retired_media if not media.close()]
+
+    def serve_media(self, content: MediaContent, range_header=None):
+        # One shared mapping per title; every request slices into it.
+        if self.retired_media:
+            self._close_retired_media()
+        media = self.media_files.get(content)
+        if media is None:
+            media = self.media_files[content] = content.open_media()
+        return media.serve(range_header)
+
+    def export_catalog(self):
+        return ContentCatalog.from_contents(self.content_library)
+
     def stream_to_device(self, user: User, content: MediaContent, device: StreamingDevice):
-        if device.check_compatibility(content):
-            return device.stream_content(content)
-        return "Incompatible content or device"
+        error = self.access_error(user, content, device)
+        if error:
+            return error
+        return device.stream_content(content)
+
+
+_batch_state = None  # (platform, id(content) -> library position) inherited by forked workers
 
+def _recommend_chunk(args):
+    start, stop, k = args
+    platform, positions = _batch_state
+    return [
+        [positions[id(content)] for content in platform.get_recommendations(user, k, use_cache=False)]
+        for user in platform.users[start:stop]
+    ]
 
 
 # Test Case 1: Abstract class instantiation should fail
@@ -399,6 +1098,9 @@ assert watch_session["status"] == "started"
 analytics = platform.get_user_analytics(user)
 assert "total_watch_time" in analytics
 assert "favorite_genres" in analytics
+assert analytics["total_watch_time"] == 148
+assert analytics["favorite_genres"] == ["Sci-Fi"]
+assert list(user.get_watch_history()) == ["Inception"]
 
 # Test Case 6: Subscription tier restrictions
 free_user = User("jane_doe", "Free", ["Comedy"])
@@ -419,10 +1121,196 @@ movie.add_rating(4.8)
 movie.add_rating(4.2)
 
 assert abs(movie.get_average_rating() - 4.5) < 0.1
+assert movie.rating_count == 3
+assert movie.get_rating_distribution() == {1: 0, 2: 0, 3: 0, 4: 3, 5: 0}
+assert movie.is_premium_content()
 
 # Highly rated content should appear in recommendations
 new_recommendations = platform.get_recommendations(user)
 highly_rated = [content for content in new_recommendations if content.get_average_rating() > 4.0]
 assert len(highly_rated) > 0
+assert new_recommendations[0] is movie
+assert platform.get_recommendations(user, k=1) == [movie]
+
+# Rankings follow each rating incrementally and always match a full re-sort
+chart = StreamingPlatform("Chart")
+tracks = [Music(f"Track {i}", "Pop", 200, "Artist", "Album", False) for i in range(30)]
+for track in tracks:
+    chart.add_content(track)
+for i in range(300):
+    tracks[(i * 7) % 30].add_rating(1 + (i * i) % 5)
+assert chart._ranked_genre("Pop", 30) == sorted(tracks, key=lambda c: c.get_average_rating(), reverse=True)
+chart.update_content(tracks[0], genre="Indie")
+assert chart._ranked_genre("Indie", 5) == [tracks[0]] and tracks[0] not in chart._ranked_genre("Pop", 30)
+
+# Test Case 8: Batch precomputation feeds the online recommendation cache
+# (workers=1: a process pool started while this module is still importing deadlocks)
+assert platform.precompute_recommendations(k=3, workers=1) == len(platform.users)
+assert platform.recommendation_cache[user] == platform.get_recommendations(user, k=3, use_cache=False)
+assert platform.get_recommendations(user, k=1) == [movie]
+
+fan, critic = User("fan", "Premium", ["Sci-Fi"]), User("critic", "Premium", ["Drama"])
+shelf = StreamingPlatform("Shelf")
+for content in (movie, tv_show):
+    shelf.add_content(content)
+shelf.register_user(fan)
+shelf.register_user(critic)
+shelf.precompute_recommendations(k=2, workers=1)
+blockbuster = Movie("Arrival", "Sci-Fi", 116, "4K", "Denis Villeneuve")
+shelf.add_content(blockbuster)
+blockbuster.add_rating(5)
+assert fan not in shelf.recommendation_cache and critic in shelf.recommendation_cache  # Drama untouched
+assert shelf.get_recommendations(fan, k=1) == [blockbuster]
+shelf.start_watching(critic, tv_show, smart_tv)
+assert critic not in shelf.recommendation_cache
+shelf.precompute_recommendations(k=2, workers=1)
+shelf.update_content(blockbuster, genre="Drama")  # leaves Sci-Fi, joins Drama
+assert fan not in shelf.recommendation_cache and critic not in shelf.recommendation_cache
+assert shelf.get_recommendations(critic, k=2) == [blockbuster, tv_show]
+assert blockbuster not in shelf.get_recommendations(fan, k=2)
+
+# Test Case 9: Vectorized catalog pricing matches the per-object methods
+class ExtendedCut(Movie):
+    def calculate_streaming_cost(self):
+        return super().calculate_streaming_cost() * 2
+
+catalog_items = contents + [Music("Intro", "Rock", 61, "Band", "EP", False), ExtendedCut("Dune", "Sci-Fi", 166, "4K", "Villeneuve")]
+catalog = ContentCatalog.from_contents(catalog_items)
+assert catalog.streaming_costs().tolist() == [c.calculate_streaming_cost() for c in catalog_items]
+assert catalog.file_sizes().tolist() == [c.get_file_size() for c in catalog_items]
+assert abs(catalog.billing_total([1, 2, 3, 4, 5, 6]) - sum(c.calculate_streaming_cost() * n for c, n in zip(catalog_items, [1, 2, 3, 4, 5, 6]))) < 1e-9
+assert len(platform.export_catalog()) == len(platform.content_library)
+
+# Test Case 10: Cached device compatibility and playable-title queries
+assert platform.playable_titles(speaker) == [podcast, music]
+assert platform.is_compatible(speaker, music) and not platform.is_compatible(speaker, movie)
+mobile_titles = platform.playable_titles(mobile)
+assert movie in mobile_titles and podcast in mobile_titles and tv_show not in mobile_titles
+platform.update_content(podcast, duration=2400)
+assert podcast not in platform.playable_titles(mobile)
+
+class KidsTV(SmartTV):
+    def check_compatibility(self, content):
+        return content.genre != "Horror"
+
+class Projector(StreamingDevice):
+    connect = stream_content = adjust_quality = lambda self, *args: None
+
+kids_tv, projector = KidsTV("Playroom TV", "32 inch", False), Projector("Beamer")
+scary = Movie("It", "Horror", 135, "4K", "Andy Muschietti")
+shelf.add_content(scary)
+assert shelf.is_compatible(smart_tv, scary) and not shelf.is_compatible(kids_tv, scary)  # own cache per class
+assert scary in shelf.playable_titles(smart_tv) and scary not in shelf.playable_titles(kids_tv)
+profiles = set(shelf.compatibility)
+assert shelf.is_compatible(projector, scary) and scary in shelf.playable_titles(projector)
+assert set(shelf.compatibility) == profiles  # devices without a profile are never cached
+
+# Test Case 11: Concurrent async sessions with adaptive quality
+async def run_sessions():
+    manager = SessionManager(platform, max_sessions=2, time_scale=0.001)
+    drops = lambda session, index: 30.0 if index < 3 else 4.0
+    return await asyncio.gather(
+        manager.stream(user, movie, smart_tv, drops, segments=6),
+        manager.stream(user, podcast, speaker, drops, segments=6),
+        manager.stream(free_user, music, mobile, drops, segments=6),
+        manager.stream(user, movie, speaker, drops, segments=6),
+    )
+
+tv_run, speaker_run, mobile_run, rejected = asyncio.run(run_sessions())
+assert tv_run["status"] == "finished" and tv_run["segments_played"] == 6
+assert tv_run["quality"] == "480p" and tv_run["quality_changes"] == 1
+assert speaker_run["quality"] == "audio only" and mobile_run["status"] == "finished"
+assert rejected["status"] == "error"
+
+async def contended_sessions(manager):
+    steady = lambda session, index: 30.0
+    return await asyncio.gather(manager.stream(user, movie, smart_tv, steady, segments=2),
+                                manager.stream(free_user, music, mobile, steady, segments=2))
+
+shared = SessionManager(platform, max_sessions=1, time_scale=0.001)
+for _ in range(2):  # the second asyncio.run gets a fresh loop but the same manager
+    assert [run["status"] for run in asyncio.run(contended_sessions(shared))] == ["finished", "finished"]
+
+# Test Case 12: Zero-copy chunked delivery with HTTP Range support
+import tempfile
+
+with tempfile.TemporaryDirectory() as media_dir:
+    media_path = os.path.join(media_dir, "inception.mp4")
+    payload = bytes(range(256)) * 40  # 10240 bytes
+    with open(media_path, "wb") as f:
+        f.write(payload)
+    platform.attach_media(movie, media_path)
+
+    status, headers, body = platform.serve_media(movie)
+    chunks = list(body)
+    assert status == 200 and headers["Content-Length"] == "10240"
+    assert all(isinstance(chunk, memoryview) for chunk in chunks)
+    assert b"".join(chunks) == payload
+
+    status, headers, body = platform.serve_media(movie, "bytes=100-199")
+    assert status == 206 and headers["Content-Range"] == "bytes 100-199/10240"
+    assert b"".join(body) == payload[100:200]
+    assert b"".join(platform.serve_media(movie, "bytes=-16")[2]) == payload[-16:]
+    assert platform.serve_media(movie, "bytes=20000-")[0] == 416
+
+    with MediaFile(media_path, chunk_size=4096) as media:
+        assert media.segment_count() == 3 and len(media.segment(2)) == 2048
+        segment = media.segment(1)
+        assert segment.obj is media.segment(0).obj  # slices share one mapping, no copies
+        segment.release()
+
+    # Re-attaching while a range response still holds slices of the old mapping
+    status, headers, body = platform.serve_media(movie, "bytes=0-99")
+    held = next(body)
+    recut_path = os.path.join(media_dir, "inception_recut.mp4")
+    with open(recut_path, "wb") as f:
+        f.write(payload[::-1])
+    platform.attach_media(movie, recut_path)
+    assert movie.media_path == recut_path and len(platform.retired_media) == 1
+    assert b"".join(platform.serve_media(movie, "bytes=0-15")[2]) == payload[::-1][:16]
+    assert bytes(held) == payload[:100]  # the open response still reads the old file
+
+    del chunks, body, segment, held
+    platform.attach_media(movie, None)
+    assert not platform.retired_media and movie not in platform.media_files
+
+# Test Case 13: Cached subscription entitlements
+assert platform.start_watching(free_user, premium_movie, smart_tv)["status"] == "error"
+assert not platform.is_entitled(free_user, movie)  # rated above 4.0 in Test Case 7
+assert platform.is_entitled(free_user, music)
+music_position = platform.content_positions[music]
+assert platform.entitlements["Free"][music_position] == COMPAT_YES
+music.add_rating(5)  # crosses the premium threshold, clearing the cached decision
+assert platform.entitlements["Free"][music_position] == COMPAT_UNKNOWN
+assert "subscription" in platform.stream_to_device(free_user, music, speaker)
+
+free_user.upgrade_subscription("Premium")
+assert platform.is_entitled(free_user, music) and platform.is_entitled(free_user, premium_movie)
+assert platform.start_watching(free_user, premium_movie, smart_tv)["status"] == "started"
+
+# Test Case 14: Time-decayed trending per genre
+tracker = TrendingTracker(half_life=60, window_seconds=300, bucket_seconds=60, board_size=2, now=0)
+extra_movie = Movie("Tenet", "Sci-Fi", 150, "4K", "Christopher Nolan")
+for second in range(10):
+    tracker.record(movie, at=second)
+for second in range(120, 124):
+    tracker.record(extra_movie, at=second)
+tracker.record(tv_show, at=125)
+assert tracker.top("Sci-Fi") == [extra_movie, movie]  # 4 fresh plays beat 10 plays two half-lives ago
+assert tracker.top(k=2) == [extra_movie, movie] and tracker.top("Drama") == [tv_show]
+assert abs(tracker.score(extra_movie, at=183) - sum(0.5 ** ((183 - t) / 60) for t in range(120, 124))) < 1e-9
+assert tracker.window_plays(movie, at=200) == 10 and tracker.window_plays(movie, at=400) == 0
+for second in range(130, 140):
+    tracker.record(music, at=second)
+assert tracker.top(k=2) == [music, extra_movie] and tracker.top(k=5)[2] is movie  # falls off the bounded board
+tracker.record(movie, at=tracker.landmark + 1000 * tracker.tau)  # forces renormalization
+assert tracker.top()[0] is movie and math.isfinite(tracker.score(music))
+
+assert platform.get_trending("Sci-Fi") == [movie]  # watched in Test Case 5
+platform.start_watching(user, podcast, smart_tv)
+platform.start_watching(user, podcast, smart_tv)
+trending = platform.get_trending()
+assert trending[0] is podcast and set(trending) == {podcast, premium_movie, movie}
+assert platform.get_trending("Technology", k=1) == [podcast]
 
 print("✅ All tests passed!")
@@ -1,7 +1,12 @@
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field, TypeAdapter
 from typing import List, Optional
 from datetime import date
+from collections import deque
+import os
+import sqlite3
+import threading
 
 app = FastAPI()
 
@@ -9,6 +14,23 @@ db_students = {}
 db_courses = {}
 db_professors = {}
 db_enrollments = []
+db_course_roster = {}         # course_id -> {student_id: Enrollment}, in enrollment order
+db_student_enrollments = {}   # student_id -> {course_id: Enrollment}, in enrollment order
+db_seats = {}      # course_id -> number of seats taken
+db_waitlists = {}  # course_id -> FIFO deque of waiting Enrollment objects
+db_waitlisted = {}  # course_id -> set of student ids in that course's waitlist
+
+# Running aggregates behind the /analytics endpoints.
+major_gpa_totals = {}   # major -> [gpa_sum, student_count]
+professor_load = {}     # professor_id -> [seats_taken, seat_capacity]
+analytics_version = 0   # bumped on every mutation that can change an aggregate
+analytics_cache = {}    # report name -> (version, payload)
+
+# Lock ordering: a course lock is always taken before enrollments_lock and analytics_lock.
+course_locks = {}
+course_locks_guard = threading.Lock()
+enrollments_lock = threading.Lock()
+analytics_lock = threading.Lock()
 
 # ======= MODELS =======
 class Student(BaseModel):
@@ -40,11 +62,343 @@ class Enrollment(BaseModel):
     enrollment_date: date
     grade: Optional[float] = None
 
+# ======= STORAGE =======
+# Optional write-through SQLite backend. The dicts above stay the working set;
+# every mutation is mirrored to the database and the dicts are reloaded from it
+# on startup when COURSE_DB_PATH is set.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS professors (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    department TEXT NOT NULL,
+    hire_date TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS students (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    major TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    gpa REAL NOT NULL DEFAULT 0.0
+);
+CREATE TABLE IF NOT EXISTS courses (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    code TEXT NOT NULL,
+    credits INTEGER NOT NULL,
+    professor_id INTEGER NOT NULL REFERENCES professors(id) ON DELETE CASCADE,
+    max_capacity INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS enrollments (
+    student_id INTEGER NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+    course_id INTEGER NOT NULL REFERENCES courses(id) ON DELETE CASCADE,
+    enrollment_date TEXT NOT NULL,
+    grade REAL,
+    PRIMARY KEY (student_id, course_id)
+);
+CREATE TABLE IF NOT EXISTS waitlist (
+    position INTEGER PRIMARY KEY,
+    student_id INTEGER NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+    course_id INTEGER NOT NULL REFERENCES courses(id) ON DELETE CASCADE,
+    enrollment_date TEXT NOT NULL,
+    grade REAL
+);
+CREATE INDEX IF NOT EXISTS idx_enrollments_course ON enrollments(course_id, student_id);
+CREATE INDEX IF NOT EXISTS idx_courses_professor ON courses(professor_id);
+CREATE INDEX IF NOT EXISTS idx_waitlist_course ON waitlist(course_id, position);
+"""
+
+# Constant SQL strings so each thread's connection compiles them once and
+# reuses the prepared statement from its statement cache.
+UPSERT_STUDENT = """
+INSERT INTO students (id, name, email, major, year, gpa) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET name = excluded.name, email = excluded.email,
+    major = excluded.major, year = excluded.year, gpa = excluded.gpa
+"""
+UPSERT_COURSE = """
+INSERT INTO courses (id, name, code, credits, professor_id, max_capacity) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET name = excluded.name, code = excluded.code, credits = excluded.credits,
+    professor_id = excluded.professor_id, max_capacity = excluded.max_capacity
+"""
+UPSERT_PROFESSOR = """
+INSERT INTO professors (id, name, email, department, hire_date) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET name = excluded.name, email = excluded.email,
+    department = excluded.department, hire_date = excluded.hire_date
+"""
+UPDATE_GPA = "UPDATE students SET gpa = ? WHERE id = ?"
+INSERT_ENROLLMENT = "INSERT OR IGNORE INTO enrollments (student_id, course_id, enrollment_date, grade) VALUES (?, ?, ?, ?)"
+UPDATE_GRADE = "UPDATE enrollments SET grade = ? WHERE student_id = ? AND course_id = ?"
+DELETE_ENROLLMENT = "DELETE FROM enrollments WHERE student_id = ? AND course_id = ?"
+INSERT_WAITLIST = "INSERT INTO waitlist (student_id, course_id, enrollment_date, grade) VALUES (?, ?, ?, ?)"
+DELETE_WAITLIST = "DELETE FROM waitlist WHERE student_id = ? AND course_id = ?"
+DELETE_STUDENT = "DELETE FROM students WHERE id = ?"
+DELETE_COURSE = "DELETE FROM courses WHERE id = ?"
+DELETE_PROFESSOR = "DELETE FROM professors WHERE id = ?"
+
+class CourseStore:
+    def __init__(self, path: str):
+        self.path = path
+        self.local = threading.local()
+        self.connection().executescript(SCHEMA)
+
+    def connection(self):
+        # One connection per thread; sqlite3 connections must not be shared.
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, cached_statements=64)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self.local.conn = conn
+        return conn
+
+    def execute(self, *statements):
+        conn = self.connection()
+        with conn:
+            for sql, params in statements:
+                conn.execute(sql, params)
+
+    def save_student(self, id: int, s: Student):
+        self.execute((UPSERT_STUDENT, (id, s.name, s.email, s.major, s.year, s.gpa)))
+
+    def save_course(self, id: int, c: Course):
+        self.execute((UPSERT_COURSE, (id, c.name, c.code, c.credits, c.professor_id, c.max_capacity)))
+
+    def save_professor(self, id: int, p: Professor):
+        self.execute((UPSERT_PROFESSOR, (id, p.name, p.email, p.department, p.hire_date.isoformat())))
+
+    def update_gpa(self, student_id: int, gpa: float):
+        self.execute((UPDATE_GPA, (gpa, student_id)))
+
+    def add_enrollment(self, e: Enrollment):
+        self.execute((INSERT_ENROLLMENT, (e.student_id, e.course_id, e.enrollment_date.isoformat(), e.grade)))
+
+    def add_to_waitlist(self, e: Enrollment):
+        self.execute((INSERT_WAITLIST, (e.student_id, e.course_id, e.enrollment_date.isoformat(), e.grade)))
+
+    def promote(self, e: Enrollment):
+        self.execute(
+            (DELETE_WAITLIST, (e.student_id, e.course_id)),
+            (INSERT_ENROLLMENT, (e.student_id, e.course_id, e.enrollment_date.isoformat(), e.grade)),
+        )
+
+    def update_grade(self, student_id: int, course_id: int, grade: float):
+        self.execute((UPDATE_GRADE, (grade, student_id, course_id)))
+
+    def delete_enrollment(self, student_id: int, course_id: int):
+        self.execute((DELETE_ENROLLMENT, (student_id, course_id)))
+
+    # Foreign keys cascade deletes to courses, enrollments and waitlist rows.
+    def delete_student(self, id: int):
+        self.execute((DELETE_STUDENT, (id,)))
+
+    def delete_course(self, id: int):
+        self.execute((DELETE_COURSE, (id,)))
+
+    def delete_professor(self, id: int):
+        self.execute((DELETE_PROFESSOR, (id,)))
+
+    def load_models(self, model, sql: str):
+        # SQLite renders the rows as one JSON array and pydantic-core parses it
+        # in a single pass, which is far cheaper than building models row by row.
+        (payload,) = self.connection().execute(sql).fetchone()
+        return TypeAdapter(List[model]).validate_json(payload)
+
+    def load(self):
+        professors = self.load_models(Professor, """
+            SELECT json_group_array(json_object('id', id, 'name', name, 'email', email,
+                'department', department, 'hire_date', hire_date)) FROM professors""")
+        students = self.load_models(Student, """
+            SELECT json_group_array(json_object('id', id, 'name', name, 'email', email,
+                'major', major, 'year', year, 'gpa', gpa)) FROM students""")
+        courses = self.load_models(Course, """
+            SELECT json_group_array(json_object('id', id, 'name', name, 'code', code, 'credits', credits,
+                'professor_id', professor_id, 'max_capacity', max_capacity)) FROM courses""")
+        enrollments = self.load_models(Enrollment, """
+            SELECT json_group_array(json_object('student_id', student_id, 'course_id', course_id,
+                'enrollment_date', enrollment_date, 'grade', grade))
+            FROM (SELECT * FROM enrollments ORDER BY rowid)""")
+        waitlisted = self.load_models(Enrollment, """
+            SELECT json_group_array(json_object('student_id', student_id, 'course_id', course_id,
+                'enrollment_date', enrollment_date, 'grade', grade))
+            FROM (SELECT * FROM waitlist ORDER BY position)""")
+        waitlists = {}
+        for e in waitlisted:
+            waitlists.setdefault(e.course_id, deque()).append(e)
+        return (
+            {s.id: s for s in students},
+            {c.id: c for c in courses},
+            {p.id: p for p in professors},
+            enrollments,
+            waitlists,
+        )
+
+store = CourseStore(os.environ["COURSE_DB_PATH"]) if os.environ.get("COURSE_DB_PATH") else None
+
+def load_from_store():
+    global db_students, db_courses, db_professors, db_enrollments, db_waitlists
+    db_students, db_courses, db_professors, db_enrollments, db_waitlists = store.load()
+    rebuild_indexes()
+
+def rebuild_indexes():
+    # Derives seats, the roster indexes and the analytics aggregates from the tables.
+    global db_seats, db_waitlisted
+    db_seats = {}
+    db_waitlisted = {cid: {e.student_id for e in waitlist} for cid, waitlist in db_waitlists.items()}
+    db_course_roster.clear()
+    db_student_enrollments.clear()
+    for e in db_enrollments:
+        db_seats[e.course_id] = db_seats.get(e.course_id, 0) + 1
+        index_enrollment(e)
+    major_gpa_totals.clear()
+    professor_load.clear()
+    for student in db_students.values():
+        track_student(student, 1)
+    for course in db_courses.values():
+        track_course(course, 1)
+
 # ======= UTILITY FUNCTIONS =======
 def calculate_gpa(student_id: int):
-    grades = [e.grade for e in db_enrollments if e.student_id == student_id and e.grade is not None]
+    enrollments = db_student_enrollments.get(student_id, {})
+    grades = [e.grade for e in enrollments.values() if e.grade is not None]
     if grades:
-        db_students[student_id].gpa = round(sum(grades) / len(grades), 2)
+        student = db_students[student_id]
+        gpa = round(sum(grades) / len(grades), 2)
+        with analytics_lock:
+            major_gpa_totals[student.major][0] += gpa - student.gpa
+            student.gpa = gpa
+            bump_analytics_version()
+        if store:
+            store.update_gpa(student_id, db_students[student_id].gpa)
+
+def bump_analytics_version():
+    # Caller must hold analytics_lock.
+    global analytics_version
+    analytics_version += 1
+
+def track_student(student: Student, sign: int):
+    with analytics_lock:
+        totals = major_gpa_totals.setdefault(student.major, [0.0, 0])
+        totals[0] += sign * student.gpa
+        totals[1] += sign
+        if totals[1] == 0:
+            del major_gpa_totals[student.major]
+        bump_analytics_version()
+
+def track_course(course: Course, sign: int):
+    with analytics_lock:
+        load = professor_load.setdefault(course.professor_id, [0, 0])
+        load[0] += sign * db_seats.get(course.id, 0)
+        load[1] += sign * course.max_capacity
+        bump_analytics_version()
+
+def track_seats(course_id: int, delta: int):
+    with analytics_lock:
+        professor_load.setdefault(db_courses[course_id].professor_id, [0, 0])[0] += delta
+        bump_analytics_version()
+
+def cached_report(name: str, compute):
+    cached = analytics_cache.get(name)
+    if cached is not None and cached[0] == analytics_version:
+        return cached[1]
+    with analytics_lock:
+        version = analytics_version
+        payload = compute()
+    analytics_cache[name] = (version, payload)
+    return payload
+
+def get_course_lock(course_id: int):
+    with course_locks_guard:
+        lock = course_locks.get(course_id)
+        if lock is None:
+            lock = course_locks[course_id] = threading.Lock()
+        return lock
+
+def reserve_seat(course_id: int):
+    # Caller must hold the course lock.
+    if db_seats.get(course_id, 0) >= db_courses[course_id].max_capacity:
+        return False
+    db_seats[course_id] = db_seats.get(course_id, 0) + 1
+    track_seats(course_id, 1)
+    return True
+
+def release_seat(course_id: int):
+    # Caller must hold the course lock.
+    if db_seats.get(course_id, 0) > 0:
+        db_seats[course_id] -= 1
+        track_seats(course_id, -1)
+
+def promote_from_waitlist(course_id: int):
+    # Caller must hold the course lock.
+    waitlist = db_waitlists.get(course_id)
+    while waitlist and course_id in db_courses:
+        if waitlist[0].student_id not in db_students:
+            db_waitlisted[course_id].discard(waitlist.popleft().student_id)
+            continue
+        if not reserve_seat(course_id):
+            break
+        enrollment = waitlist.popleft()
+        db_waitlisted[course_id].discard(enrollment.student_id)
+        add_enrollment(enrollment)
+        if store:
+            store.promote(enrollment)
+
+def index_enrollment(e: Enrollment):
+    db_course_roster.setdefault(e.course_id, {})[e.student_id] = e
+    db_student_enrollments.setdefault(e.student_id, {})[e.course_id] = e
+
+def unindex_enrollment(e: Enrollment):
+    roster = db_course_roster.get(e.course_id)
+    if roster is not None:
+        roster.pop(e.student_id, None)
+        if not roster:
+            del db_course_roster[e.course_id]
+    enrollments = db_student_enrollments.get(e.student_id)
+    if enrollments is not None:
+        enrollments.pop(e.course_id, None)
+        if not enrollments:
+            del db_student_enrollments[e.student_id]
+
+def add_enrollment(e: Enrollment):
+    with enrollments_lock:
+        db_enrollments.append(e)
+        index_enrollment(e)
+
+def remove_enrollments(predicate):
+    global db_enrollments
+    with enrollments_lock:
+        removed = [e for e in db_enrollments if predicate(e)]
+        if removed:
+            db_enrollments = [e for e in db_enrollments if not predicate(e)]
+            for e in removed:
+                unindex_enrollment(e)
+    return removed
+
+def parse_fields(fields: Optional[str], allowed, default):
+    if fields is None:
+        return default
+    names = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in names if f not in allowed]
+    if unknown or not names:
+        raise HTTPException(status_code=400, detail=f"Invalid fields, choose from: {', '.join(allowed)}")
+    return names
+
+def field_value(value):
+    return value.isoformat() if isinstance(value, date) else value
+
+def drop_course_state(course_id: int):
+    with get_course_lock(course_id):
+        course = db_courses.pop(course_id, None)
+        if course is not None:
+            track_course(course, -1)
+        remove_enrollments(lambda e: e.course_id == course_id)
+        db_seats.pop(course_id, None)
+        db_waitlists.pop(course_id, None)
+        db_waitlisted.pop(course_id, None)
+
+if store:
+    load_from_store()
 
 # ======= STUDENTS =======
 @app.get("/students", response_model=List[Student])
@@ -56,6 +410,9 @@ def create_student(student: Student):
     if student.id in db_students:
         raise HTTPException(status_code=400, detail="Student already exists")
     db_students[student.id] = student
+    track_student(student, 1)
+    if store:
+        store.save_student(student.id, student)
     return student
 
 @app.get("/students/{id}", response_model=Student)
@@ -68,22 +425,61 @@ def get_student(id: int):
 def update_student(id: int, student: Student):
     if id not in db_students:
         raise HTTPException(status_code=404, detail="Student not found")
+    track_student(db_students[id], -1)
     db_students[id] = student
+    track_student(student, 1)
+    if store:
+        store.save_student(id, student)
     return student
 
 @app.delete("/students/{id}")
 def delete_student(id: int):
-    db_students.pop(id, None)
-    global db_enrollments
-    db_enrollments = [e for e in db_enrollments if e.student_id != id]
+    student = db_students.pop(id, None)
+    if student is not None:
+        track_student(student, -1)
+    if store:
+        store.delete_student(id)
+    # Enrollments that race with this delete roll themselves back, see enroll_student.
+    course_ids = set(db_student_enrollments.get(id, ()))
+    course_ids.update(cid for cid, waitlisted in list(db_waitlisted.items()) if id in waitlisted)
+    for cid in course_ids:
+        with get_course_lock(cid):
+            waitlisted = db_waitlisted.get(cid)
+            if waitlisted and id in waitlisted:
+                waitlisted.discard(id)
+                db_waitlists[cid] = deque(e for e in db_waitlists[cid] if e.student_id != id)
+            for _ in remove_enrollments(lambda e: e.student_id == id and e.course_id == cid):
+                release_seat(cid)
+            promote_from_waitlist(cid)
     return {"message": "Student deleted"}
 
 @app.get("/students/{id}/courses")
-def get_student_courses(id: int):
+def get_student_courses(id: int, fields: Optional[str] = None):
+    if id not in db_students:
+        raise HTTPException(status_code=404, detail="Student not found")
+    enrolled_course_ids = list(db_student_enrollments.get(id, ()))
+    if fields is None:
+        return [db_courses[cid] for cid in enrolled_course_ids if cid in db_courses]
+    names = parse_fields(fields, tuple(Course.model_fields), None)
+    return JSONResponse([
+        {f: field_value(getattr(db_courses[cid], f)) for f in names}
+        for cid in enrolled_course_ids if cid in db_courses
+    ])
+
+TRANSCRIPT_FIELDS = tuple(Course.model_fields) + ("enrollment_date", "grade")
+
+@app.get("/students/{id}/transcript")
+def get_student_transcript(id: int, fields: Optional[str] = None):
     if id not in db_students:
         raise HTTPException(status_code=404, detail="Student not found")
-    enrolled_course_ids = [e.course_id for e in db_enrollments if e.student_id == id]
-    return [db_courses[cid] for cid in enrolled_course_ids if cid in db_courses]
+    names = parse_fields(fields, TRANSCRIPT_FIELDS, ["id", "code", "name", "credits", "grade"])
+    rows = []
+    for cid, e in db_student_enrollments.get(id, {}).items():
+        course = db_courses.get(cid)
+        if course is not None:
+            rows.append({f: field_value(getattr(e, f) if f in ("enrollment_date", "grade") else getattr(course, f))
+                         for f in names})
+    return JSONResponse(rows)
 
 # ======= COURSES =======
 @app.get("/courses", response_model=List[Course])
@@ -96,7 +492,9 @@ def create_course(course: Course):
         raise HTTPException(status_code=400, detail="Course already exists")
     if course.professor_id not in db_professors:
         raise HTTPException(status_code=400, detail="Professor does not exist")
+    save_course(course.id, course)
     db_courses[course.id] = course
+    track_course(course, 1)
     return course
 
 @app.get("/courses/{id}", response_model=Course)
@@ -109,22 +507,66 @@ def get_course(id: int):
 def update_course(id: int, course: Course):
     if id not in db_courses:
         raise HTTPException(status_code=404, detail="Course not found")
-    db_courses[id] = course
+    if course.professor_id not in db_professors:
+        raise HTTPException(status_code=400, detail="Professor does not exist")
+    with get_course_lock(id):
+        if id not in db_courses:
+            raise HTTPException(status_code=404, detail="Course not found")
+        save_course(id, course)
+        track_course(db_courses[id], -1)
+        db_courses[id] = course
+        track_course(course, 1)
+        promote_from_waitlist(id)
     return course
 
+def save_course(id: int, course: Course):
+    # Written before the in-memory tables change, so a rejected write leaves them untouched.
+    if store:
+        try:
+            store.save_course(id, course)
+        except sqlite3.IntegrityError as exc:  # the professor row was deleted meanwhile
+            raise HTTPException(status_code=400, detail="Professor does not exist") from exc
+
 @app.delete("/courses/{id}")
 def delete_course(id: int):
-    db_courses.pop(id, None)
-    global db_enrollments
-    db_enrollments = [e for e in db_enrollments if e.course_id != id]
+    if store:
+        store.delete_course(id)
+    drop_course_state(id)
     return {"message": "Course deleted"}
 
 @app.get("/courses/{id}/students")
-def get_course_students(id: int):
+def get_course_students(id: int, fields: Optional[str] = None):
+    if id not in db_courses:
+        raise HTTPException(status_code=404, detail="Course not found")
+    student_ids = list(db_course_roster.get(id, ()))
+    if fields is None:
+        return [db_students[sid] for sid in student_ids if sid in db_students]
+    names = parse_fields(fields, tuple(Student.model_fields), None)
+    return JSONResponse([
+        {f: field_value(getattr(db_students[sid], f)) for f in names}
+        for sid in student_ids if sid in db_students
+    ])
+
+ROSTER_FIELDS = tuple(Student.model_fields) + ("enrollment_date", "grade")
+
+@app.get("/courses/{id}/roster")
+def get_course_roster(id: int, fields: Optional[str] = None):
     if id not in db_courses:
         raise HTTPException(status_code=404, detail="Course not found")
-    student_ids = [e.student_id for e in db_enrollments if e.course_id == id]
-    return [db_students[sid] for sid in student_ids if sid in db_students]
+    names = parse_fields(fields, ROSTER_FIELDS, ["id", "name", "grade"])
+    rows = []
+    for sid, e in db_course_roster.get(id, {}).items():
+        student = db_students.get(sid)
+        if student is not None:
+            rows.append({f: field_value(getattr(e, f) if f in ("enrollment_date", "grade") else getattr(student, f))
+                         for f in names})
+    return JSONResponse(rows)
+
+@app.get("/courses/{id}/waitlist", response_model=List[Enrollment])
+def get_course_waitlist(id: int):
+    if id not in db_courses:
+        raise HTTPException(status_code=404, detail="Course not found")
+    return list(db_waitlists.get(id, ()))
 
 # ======= PROFESSORS =======
 @app.get("/professors", response_model=List[Professor])
@@ -135,7 +577,11 @@ def get_professors():
 def create_professor(professor: Professor):
     if professor.id in db_professors:
         raise HTTPException(status_code=400, detail="Professor already exists")
-    db_professors[professor.id] = professor
+    with analytics_lock:
+        db_professors[professor.id] = professor
+        bump_analytics_version()
+    if store:
+        store.save_professor(professor.id, professor)
     return professor
 
 @app.get("/professors/{id}", response_model=Professor)
@@ -148,17 +594,25 @@ def get_professor(id: int):
 def update_professor(id: int, professor: Professor):
     if id not in db_professors:
         raise HTTPException(status_code=404, detail="Professor not found")
-    db_professors[id] = professor
+    with analytics_lock:
+        db_professors[id] = professor
+        bump_analytics_version()
+    if store:
+        store.save_professor(id, professor)
     return professor
 
 @app.delete("/professors/{id}")
 def delete_professor(id: int):
-    db_professors.pop(id, None)
+    with analytics_lock:
+        db_professors.pop(id, None)
+        bump_analytics_version()
+    if store:
+        store.delete_professor(id)
     for cid in list(db_courses):
         if db_courses[cid].professor_id == id:
-            del db_courses[cid]
-            global db_enrollments
-            db_enrollments = [e for e in db_enrollments if e.course_id != cid]
+            drop_course_state(cid)
+    with analytics_lock:
+        professor_load.pop(id, None)
     return {"message": "Professor and related courses deleted"}
 
 @app.get("/professors/{id}/courses")
@@ -173,38 +627,124 @@ def get_enrollments():
     return db_enrollments
 
 @app.post("/enrollments")
-def enroll_student(enrollment: Enrollment):
+def enroll_student(enrollment: Enrollment, join_waitlist: bool = False):
     if enrollment.student_id not in db_students or enrollment.course_id not in db_courses:
         raise HTTPException(status_code=404, detail="Student or Course not found")
 
-    if any(e.student_id == enrollment.student_id and e.course_id == enrollment.course_id for e in db_enrollments):
-        raise HTTPException(status_code=400, detail="Already enrolled")
-
-    current_enrollment = sum(1 for e in db_enrollments if e.course_id == enrollment.course_id)
-    if current_enrollment >= db_courses[enrollment.course_id].max_capacity:
-        raise HTTPException(status_code=400, detail="Course at full capacity")
-
-    db_enrollments.append(enrollment)
-    return {"message": "Student enrolled"}
+    course_id, student_id = enrollment.course_id, enrollment.student_id
+    with get_course_lock(course_id):
+        if student_id not in db_students or course_id not in db_courses:
+            raise HTTPException(status_code=404, detail="Student or Course not found")
+
+        if student_id in db_course_roster.get(course_id, {}):
+            raise HTTPException(status_code=400, detail="Already enrolled")
+
+        waitlisted = db_waitlisted.setdefault(course_id, set())
+        if student_id in waitlisted:
+            raise HTTPException(status_code=400, detail="Already on waitlist")
+
+        if not reserve_seat(course_id):
+            if not join_waitlist:
+                raise HTTPException(status_code=400, detail="Course at full capacity")
+            waitlist = db_waitlists.setdefault(course_id, deque())
+            waitlist.append(enrollment)
+            waitlisted.add(student_id)
+
+            def undo():
+                waitlist.remove(enrollment)
+                waitlisted.discard(student_id)
+            persist, reply = store and store.add_to_waitlist, {"message": "Added to waitlist", "position": len(waitlist)}
+        else:
+            add_enrollment(enrollment)
+
+            def undo():
+                remove_enrollments(lambda e: e is enrollment)
+                release_seat(course_id)
+            persist, reply = store and store.add_enrollment, {"message": "Student enrolled"}
+
+        try:
+            if persist:
+                persist(enrollment)
+        except Exception as exc:
+            undo()
+            if isinstance(exc, sqlite3.IntegrityError):  # the student or course row is already gone
+                raise HTTPException(status_code=404, detail="Student or Course not found") from exc
+            raise
+        # delete_student pops the student before collecting the courses it cleans
+        # up, so a write that lands after that snapshot has to undo itself here.
+        if student_id not in db_students:
+            undo()
+            raise HTTPException(status_code=404, detail="Student or Course not found")
+    return reply
 
 @app.put("/enrollments/{student_id}/{course_id}")
 def update_grade(student_id: int, course_id: int, grade: float):
-    for e in db_enrollments:
-        if e.student_id == student_id and e.course_id == course_id:
-            e.grade = grade
-            calculate_gpa(student_id)
-            return {"message": "Grade updated"}
-    raise HTTPException(status_code=404, detail="Enrollment not found")
+    e = db_course_roster.get(course_id, {}).get(student_id)
+    if e is None:
+        raise HTTPException(status_code=404, detail="Enrollment not found")
+    e.grade = grade
+    if store:
+        store.update_grade(student_id, course_id, grade)
+    calculate_gpa(student_id)
+    return {"message": "Grade updated"}
 
 @app.delete("/enrollments/{student_id}/{course_id}")
 def delete_enrollment(student_id: int, course_id: int):
-    global db_enrollments
-    db_enrollments = [e for e in db_enrollments if not (e.student_id == student_id and e.course_id == course_id)]
-    calculate_gpa(student_id)
+    with get_course_lock(course_id):
+        for _ in remove_enrollments(lambda e: e.student_id == student_id and e.course_id == course_id):
+            release_seat(course_id)
+            if store:
+                store.delete_enrollment(student_id, course_id)
+        promote_from_waitlist(course_id)
+    if student_id in db_students:
+        calculate_gpa(student_id)
     return {"message": "Enrollment removed"}
 
 
 
+# ======= ANALYTICS =======
+# Reports are rebuilt from the running aggregates (O(groups), not O(rows)) and
+# then served from analytics_cache until the next mutation bumps the version.
+@app.get("/analytics/majors")
+def get_major_analytics():
+    def compute():
+        return {
+            major: {"students": count, "average_gpa": round(gpa_sum / count, 2)}
+            for major, (gpa_sum, count) in major_gpa_totals.items()
+        }
+    return cached_report("majors", compute)
+
+@app.get("/analytics/professors")
+def get_professor_analytics():
+    def compute():
+        report = []
+        for pid, professor in db_professors.items():
+            seats, capacity = professor_load.get(pid, (0, 0))
+            report.append({
+                "professor_id": pid,
+                "name": professor.name,
+                "department": professor.department,
+                "seats_taken": seats,
+                "capacity": capacity,
+                "fill_rate": round(seats / capacity, 4) if capacity else 0.0,
+            })
+        return report
+    return cached_report("professors", compute)
+
+@app.get("/analytics/departments")
+def get_department_analytics():
+    def compute():
+        report = {}
+        for pid, professor in db_professors.items():
+            seats, capacity = professor_load.get(pid, (0, 0))
+            totals = report.setdefault(professor.department, {"professors": 0, "enrollments": 0, "capacity": 0})
+            totals["professors"] += 1
+            totals["enrollments"] += seats
+            totals["capacity"] += capacity
+        return report
+    return cached_report("departments", compute)
+
+
 # ============================== TESTS ==============================
 from fastapi.testclient import TestClient
 client=TestClient(app)
@@ -219,6 +759,220 @@ def test_all():
     student = client.get("/students/1").json()
     assert student["gpa"] == 4.0
 
-test_all()
-
-print("All tests passed successfully!")
\ No newline at end of file
+def test_concurrent_enrollment():
+    import sys
+    from concurrent.futures import ThreadPoolExecutor
+
+    capacity = 50
+    student_ids = range(1000, 4000)
+    create_course(Course(id=2, name="Data Structures", code="CS201", credits=4, professor_id=1, max_capacity=capacity))
+    for sid in student_ids:
+        create_student(Student(id=sid, name=f"Student {sid}", email=f"s{sid}@example.com", major="CS", year=1))
+
+    def attempt(sid):
+        try:
+            return enroll_student(Enrollment(student_id=sid, course_id=2, enrollment_date=date(2023, 1, 1)), join_waitlist=True)
+        except HTTPException as exc:
+            return {"message": exc.detail}
+
+    old_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=64) as pool:
+            results = list(pool.map(attempt, student_ids))
+    finally:
+        sys.setswitchinterval(old_interval)
+
+    enrolled = [e.student_id for e in db_enrollments if e.course_id == 2]
+    assert len(enrolled) == capacity == db_seats[2]
+    assert sum(r["message"] == "Student enrolled" for r in results) == capacity
+    assert len(db_waitlists[2]) == len(student_ids) - capacity
+
+    # Dropping a seat promotes the head of the waitlist.
+    next_in_line = db_waitlists[2][0].student_id
+    delete_enrollment(enrolled[0], 2)
+    assert any(e.student_id == next_in_line and e.course_id == 2 for e in db_enrollments)
+    assert db_seats[2] == capacity
+
+    delete_course(2)
+    for sid in student_ids:
+        delete_student(sid)
+    assert 2 not in db_waitlists and 2 not in db_seats
+
+def test_enroll_delete_race():
+    import sys
+    from concurrent.futures import ThreadPoolExecutor
+
+    create_course(Course(id=3, name="Compilers", code="CS401", credits=4, professor_id=1, max_capacity=150))
+    student_ids = range(5000, 5400)
+    for sid in student_ids:
+        create_student(Student(id=sid, name=f"Student {sid}", email=f"s{sid}@example.com", major="CS", year=4))
+
+    def enroll(sid):
+        try:
+            enroll_student(Enrollment(student_id=sid, course_id=3, enrollment_date=date(2023, 1, 1)), join_waitlist=True)
+        except HTTPException:
+            pass
+
+    jobs = [job for sid in student_ids for job in ((enroll, sid), (delete_student, sid))]
+    old_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            list(pool.map(lambda job: job[0](job[1]), jobs))
+    finally:
+        sys.setswitchinterval(old_interval)
+
+    # Every student was deleted, so no seat or waitlist slot may survive them.
+    assert not db_course_roster.get(3) and db_seats.get(3, 0) == 0
+    assert not db_waitlists.get(3) and not db_waitlisted.get(3)
+    delete_course(3)
+
+def test_sqlite_persistence():
+    import tempfile
+    global store
+
+    previous_store = store
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CourseStore(os.path.join(tmp, "courses.db"))
+        try:
+            create_professor(Professor(id=50, name="Dr. Lee", email="lee@example.com", department="Math", hire_date=date(2019, 9, 1)))
+            create_student(Student(id=50, name="Bob", email="bob@example.com", major="Math", year=1))
+            create_student(Student(id=51, name="Carol", email="carol@example.com", major="Math", year=3))
+            create_course(Course(id=50, name="Calculus", code="MA101", credits=3, professor_id=50, max_capacity=1))
+            enroll_student(Enrollment(student_id=50, course_id=50, enrollment_date=date(2023, 1, 1)))
+            enroll_student(Enrollment(student_id=51, course_id=50, enrollment_date=date(2023, 1, 2)), join_waitlist=True)
+            update_grade(50, 50, 3.5)
+
+            students, courses, professors, enrollments, waitlists = store.load()
+            assert students[50].gpa == 3.5 and professors[50].hire_date == date(2019, 9, 1)
+            assert [(e.student_id, e.grade) for e in enrollments] == [(50, 3.5)]
+            assert [e.student_id for e in waitlists[50]] == [51]
+
+            delete_enrollment(50, 50)
+            students, courses, professors, enrollments, waitlists = store.load()
+            assert [e.student_id for e in enrollments] == [51] and not waitlists
+
+            # A write rejected by the store gives its seat back.
+            create_course(Course(id=51, name="Algebra", code="MA102", credits=3, professor_id=50, max_capacity=5))
+            store.delete_student(50)
+            try:
+                enroll_student(Enrollment(student_id=50, course_id=51, enrollment_date=date(2023, 1, 3)))
+                assert False, "Expected the store to reject the enrollment"
+            except HTTPException as exc:
+                assert exc.status_code == 404
+            assert db_seats.get(51, 0) == 0 and 51 not in db_course_roster
+
+            # Courses naming a missing professor are rejected before anything changes.
+            moved = Course(id=51, name="Algebra", code="MA102", credits=3, professor_id=99, max_capacity=5)
+            assert client.put("/courses/51", json=moved.model_dump()).status_code == 400
+            create_professor(Professor(id=52, name="Dr. Kay", email="kay@example.com", department="Math", hire_date=date(2021, 1, 1)))
+            store.delete_professor(52)  # gone from the store only, as if deleted concurrently
+            for request in (lambda: update_course(51, moved.model_copy(update={"professor_id": 52})),
+                            lambda: create_course(Course(id=52, name="Topology", code="MA301", credits=3, professor_id=52, max_capacity=5))):
+                try:
+                    request()
+                    assert False, "Expected the store to reject the course"
+                except HTTPException as exc:
+                    assert exc.status_code == 400
+            assert db_courses[51].professor_id == 50 and 52 not in db_courses and 52 not in professor_load
+            assert store.load()[1][51].professor_id == 50
+            delete_professor(52)
+
+            delete_professor(50)
+            students, courses, professors, enrollments, waitlists = store.load()
+            assert not courses and not professors and not enrollments
+        finally:
+            delete_student(50)
+            delete_student(51)
+            store = previous_store
+
+def test_restart_from_store():
+    import tempfile
+    global store, db_students, db_courses, db_professors, db_enrollments, db_waitlists
+
+    saved = (store, db_students, db_courses, db_professors, db_enrollments, db_waitlists)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CourseStore(os.path.join(tmp, "courses.db"))
+        try:
+            store.save_professor(80, Professor(id=80, name="Dr. Roy", email="roy@example.com", department="Biology", hire_date=date(2015, 3, 1)))
+            store.save_student(80, Student(id=80, name="Erin", email="erin@example.com", major="Biology", year=2, gpa=3.0))
+            store.save_student(81, Student(id=81, name="Frank", email="frank@example.com", major="Biology", year=1))
+            store.save_course(80, Course(id=80, name="Genetics", code="BI201", credits=3, professor_id=80, max_capacity=1))
+            store.add_enrollment(Enrollment(student_id=80, course_id=80, enrollment_date=date(2023, 1, 1), grade=3.0))
+            store.add_to_waitlist(Enrollment(student_id=81, course_id=80, enrollment_date=date(2023, 1, 2)))
+
+            load_from_store()
+            assert set(db_students) == {80, 81} and db_seats == {80: 1}
+            assert list(db_course_roster[80]) == [80] and list(db_student_enrollments[80]) == [80]
+            assert [e.student_id for e in db_waitlists[80]] == [81]
+            assert get_major_analytics() == {"Biology": {"students": 2, "average_gpa": 1.5}}
+            assert professor_load == {80: [1, 1]}
+
+            # The restarted state keeps working: dropping the seat promotes the waitlist.
+            delete_enrollment(80, 80)
+            assert list(db_course_roster[80]) == [81]
+            assert [e.student_id for e in store.load()[3]] == [81]
+        finally:
+            store, db_students, db_courses, db_professors, db_enrollments, db_waitlists = saved
+            rebuild_indexes()
+
+def test_roster_projection():
+    create_student(Student(id=2, name="Dave", email="dave@example.com", major="Math", year=3))
+    assert client.post("/enrollments", json={"student_id": 2, "course_id": 1, "enrollment_date": "2023-01-05"}).status_code == 200
+    assert client.put("/enrollments/2/1?grade=3.0").status_code == 200
+
+    roster = client.get("/courses/1/roster").json()
+    assert roster == [{"id": 1, "name": "Alice", "grade": 4.0}, {"id": 2, "name": "Dave", "grade": 3.0}]
+    assert client.get("/courses/1/roster?fields=email,enrollment_date").json()[1] == {"email": "dave@example.com", "enrollment_date": "2023-01-05"}
+    assert client.get("/courses/1/students?fields=id,major").json() == [{"id": 1, "major": "CS"}, {"id": 2, "major": "Math"}]
+    assert client.get("/courses/1/roster?fields=password").status_code == 400
+
+    transcript = client.get("/students/2/transcript").json()
+    assert transcript == [{"id": 1, "code": "CS101", "name": "Python", "credits": 4, "grade": 3.0}]
+    assert client.get("/students/2/courses?fields=code").json() == [{"code": "CS101"}]
+
+    delete_student(2)
+    assert [row["id"] for row in client.get("/courses/1/roster").json()] == [1]
+
+def test_analytics():
+    create_professor(Professor(id=70, name="Dr. Ng", email="ng@example.com", department="Physics", hire_date=date(2018, 1, 1)))
+    create_course(Course(id=70, name="Mechanics", code="PH101", credits=4, professor_id=70, max_capacity=4))
+    create_course(Course(id=71, name="Optics", code="PH201", credits=3, professor_id=70, max_capacity=6))
+    for sid, grade in ((70, 3.0), (71, 4.0)):
+        create_student(Student(id=sid, name=f"Physicist {sid}", email=f"p{sid}@example.com", major="Physics", year=2))
+        enroll_student(Enrollment(student_id=sid, course_id=70, enrollment_date=date(2023, 1, 1)))
+        update_grade(sid, 70, grade)
+    enroll_student(Enrollment(student_id=70, course_id=71, enrollment_date=date(2023, 1, 1)))
+
+    majors = client.get("/analytics/majors").json()
+    assert majors["Physics"] == {"students": 2, "average_gpa": 3.5}
+    professor = next(p for p in client.get("/analytics/professors").json() if p["professor_id"] == 70)
+    assert (professor["seats_taken"], professor["capacity"], professor["fill_rate"]) == (3, 10, 0.3)
+    assert client.get("/analytics/departments").json()["Physics"] == {"professors": 1, "enrollments": 3, "capacity": 10}
+
+    # Repeated reads are served from the cache until something changes.
+    version = analytics_version
+    assert get_department_analytics() is get_department_analytics()
+    assert analytics_version == version
+
+    delete_enrollment(71, 70)
+    assert get_department_analytics()["Physics"]["enrollments"] == 2
+    delete_professor(70)
+    assert "Physics" not in get_department_analytics() and 70 not in professor_load
+    delete_student(70)
+    delete_student(71)
+    assert "Physics" not in get_major_analytics()
+
+# The tests write fixed ids, so they only run against the in-memory tables;
+# the SQLite tests bring their own temporary stores.
+if store is None:
+    test_all()
+    test_roster_projection()
+    test_analytics()
+    test_concurrent_enrollment()
+    test_enroll_delete_race()
+    test_sqlite_persistence()
+    test_restart_from_store()
+
+    print("All tests passed successfully!")
\ No newline at end of file